@@ -2,9 +2,9 @@
 
 import asyncio
 import os
+from pathlib import Path
 from typing import Callable, Dict, Optional, Tuple
 
-from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
@@ -161,7 +161,7 @@ class CommandHandler:
             selected = interactive_select("History options:", options)
 
             if selected == "clear":
-                self.session.clear()
+                await self.session.aclear()
                 print_success("Conversation history cleared")
                 return CommandResult()
             elif selected == "show":
@@ -171,7 +171,7 @@ class CommandHandler:
                 return CommandResult()
 
         elif args[0].lower() == "clear":
-            self.session.clear()
+            await self.session.aclear()
             print_success("Conversation history cleared")
             return CommandResult()
 
@@ -212,7 +212,7 @@ class CommandHandler:
         else:
             keep = int(args[0]) if args[0].isdigit() else 10
 
-        removed = self.session.compact(keep)
+        removed = await self.session.acompact(keep)
         if removed:
             print_success(f"Compacted: removed {removed} old messages, keeping {keep} recent")
         else:
@@ -246,7 +246,7 @@ class CommandHandler:
         else:
             count = int(args[0]) if args[0].isdigit() else 2
 
-        removed = self.session.rewind(count)
+        removed = await self.session.arewind(count)
         if removed:
             print_success(f"Rewound {removed} messages")
         else:
@@ -334,8 +334,18 @@ class CommandHandler:
                 print_info("Cancelled")
                 return CommandResult()
 
+        if args and args[0].lower() == "export":
+            path = Path(os.path.expanduser(args[1])) if len(args) > 1 else None
+            try:
+                exported = self.session.export_json(path)
+            except OSError as e:
+                print_error(f"Export failed: {e}")
+                return CommandResult(False)
+            print_success(f"Session exported: {exported}")
+            return CommandResult()
+
         if args and args[0].lower() != "list":
-            print_error("Usage: /session  OR  /session list")
+            print_error("Usage: /session  OR  /session list  OR  /session export [path[.zst]]")
             return CommandResult(False)
 
         # List sessions
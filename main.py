@@ -19,6 +19,7 @@ import json
 import os
 import signal
 import sys
+import traceback
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
@@ -31,8 +32,7 @@ from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.keys import Keys
 from prompt_toolkit.completion import Completer, Completion
-
-from rich.console import Console
+from prompt_toolkit.formatted_text import FormattedText
 
 from config import config
 from api import api, GLMAPIError
@@ -111,6 +111,10 @@ class GLMCLI:
         self.tool_executor = None
         self.current_agent = None  # Current active agent
 
+        # Prompt tokens (built once; tool mode can be toggled at runtime)
+        self._prompt_tokens = FormattedText([('class:prompt', '❯ ')])
+        self._tool_prompt_tokens = FormattedText([('class:prompt', '🔧❯ ')])
+
         # Setup key bindings
         self.bindings = KeyBindings()
         self._setup_keybindings()
@@ -119,7 +123,7 @@ class GLMCLI:
         self.completer = SlashCommandCompleter([
             '/help', '/clear', '/exit', '/quit', '/model', '/model list',
             '/model set', '/history', '/history clear', '/compact', '/rewind',
-            '/config', '/config set', '/session', '/session list', '/version',
+            '/config', '/config set', '/session', '/session list', '/session export', '/version',
             '/tools', '/tools list', '/tools enable', '/tools disable',
             '/mcp', '/mcp list', '/mcp connect', '/mcp disconnect',
             '/agent', '/agent list', '/agent use', '/agent clear',
@@ -194,6 +198,11 @@ class GLMCLI:
             style=get_prompt_style(),
             completer=self.completer,
             complete_while_typing=True,  # /m 입력 시 /mcp, /model 등 바로 표시
+            # 채팅 REPL에서 쓰지 않는 기능은 명시적으로 꺼서 키 입력마다 필터 평가를 줄임
+            mouse_support=False,
+            enable_history_search=False,
+            enable_system_prompt=False,
+            enable_suspend=False,
         )
 
         # Initialize tools if enabled
@@ -285,6 +294,8 @@ class GLMCLI:
             await self._send_message_with_tools(user_input)
         else:
             await self._send_message(user_input)
+        # 턴이 끝나면 지연된 메타데이터 저장 (유휴 상태에서 meta.json이 오래된 값으로 남지 않도록)
+        await self.session.aflush()
 
         return True
 
@@ -329,9 +340,10 @@ class GLMCLI:
                 elif selected == "list":
                     if self.tool_executor:
                         tools = self.tool_executor.get_all_tools()
-                        console.print("\n[bold]Available Tools:[/bold]")
+                        lines = ["\n[bold]Available Tools:[/bold]"]
                         for tool in tools:
-                            console.print(f"  [{Colors.ACCENT}]{tool['name']}[/{Colors.ACCENT}] - {tool.get('description', '')[:60]}")
+                            lines.append(f"  [{Colors.ACCENT}]{tool['name']}[/{Colors.ACCENT}] - {tool.get('description', '')[:60]}")
+                        console.print("\n".join(lines))
                     else:
                         print_warning("Tools not initialized")
                 elif selected == "enable":
@@ -348,9 +360,10 @@ class GLMCLI:
             if subcmd == "list":
                 if self.tool_executor:
                     tools = self.tool_executor.get_all_tools()
-                    console.print("\n[bold]Available Tools:[/bold]")
+                    lines = ["\n[bold]Available Tools:[/bold]"]
                     for tool in tools:
-                        console.print(f"  [{Colors.ACCENT}]{tool['name']}[/{Colors.ACCENT}] - {tool.get('description', '')[:60]}")
+                        lines.append(f"  [{Colors.ACCENT}]{tool['name']}[/{Colors.ACCENT}] - {tool.get('description', '')[:60]}")
+                    console.print("\n".join(lines))
                 else:
                     print_warning("Tools not initialized")
 
@@ -384,10 +397,11 @@ class GLMCLI:
                 if selected == "status":
                     console.print(f"\n[bold]MCP Servers:[/bold] {len(servers)} configured, {len(connected)} connected")
                 elif selected == "list":
-                    console.print("\n[bold]MCP Servers:[/bold]")
+                    lines = ["\n[bold]MCP Servers:[/bold]"]
                     for server in servers:
                         status = "✓" if server in connected else "○"
-                        console.print(f"  {status} [{Colors.ACCENT}]{server}[/{Colors.ACCENT}]")
+                        lines.append(f"  {status} [{Colors.ACCENT}]{server}[/{Colors.ACCENT}]")
+                    console.print("\n".join(lines))
                 elif selected == "connect":
                     # Show server selection
                     server_options = [(s, f"{'✓ ' if s in connected else '○ '}{s}") for s in servers]
@@ -407,10 +421,11 @@ class GLMCLI:
             if subcmd == "list":
                 servers = self.tool_executor.list_mcp_servers()
                 connected = self.tool_executor.list_connected_mcp()
-                console.print("\n[bold]MCP Servers:[/bold]")
+                lines = ["\n[bold]MCP Servers:[/bold]"]
                 for server in servers:
                     status = "✓" if server in connected else "○"
-                    console.print(f"  {status} [{Colors.ACCENT}]{server}[/{Colors.ACCENT}]")
+                    lines.append(f"  {status} [{Colors.ACCENT}]{server}[/{Colors.ACCENT}]")
+                console.print("\n".join(lines))
 
             elif subcmd == "connect" and len(args) > 1:
                 server_name = args[1]
@@ -446,10 +461,11 @@ class GLMCLI:
 
         if subcmd == "list":
             agents = agent_registry.list_agents()
-            console.print("\n[bold]Available Agents:[/bold]")
+            lines = ["\n[bold]Available Agents:[/bold]"]
             for agent in agents:
                 marker = "●" if self.current_agent and self.current_agent.name == agent['name'] else "○"
-                console.print(f"  {marker} [{Colors.ACCENT}]{agent['name']}[/{Colors.ACCENT}] - {agent['description']}")
+                lines.append(f"  {marker} [{Colors.ACCENT}]{agent['name']}[/{Colors.ACCENT}] - {agent['description']}")
+            console.print("\n".join(lines))
 
         elif subcmd == "use" and len(args) > 1:
             agent_name = args[1]
@@ -477,20 +493,23 @@ class GLMCLI:
 
         if not args:
             # Show skill help
-            console.print("\n[bold]Skill Commands:[/bold]")
-            console.print("  /skill list         - List available skills")
-            console.print("  /skill run <name>   - Run a skill")
-            console.print("\n[bold]Skill Shortcuts:[/bold]")
-            console.print("  /commit, /review, /test, /docs, /refactor, /audit")
+            console.print(
+                "\n[bold]Skill Commands:[/bold]\n"
+                "  /skill list         - List available skills\n"
+                "  /skill run <name>   - Run a skill\n"
+                "\n[bold]Skill Shortcuts:[/bold]\n"
+                "  /commit, /review, /test, /docs, /refactor, /audit"
+            )
             return True
 
         subcmd = args[0].lower()
 
         if subcmd == "list":
             skills = skill_registry.list_skills()
-            console.print("\n[bold]Available Skills:[/bold]")
+            lines = ["\n[bold]Available Skills:[/bold]"]
             for skill in skills:
-                console.print(f"  [{Colors.ACCENT}]/{skill['name']}[/{Colors.ACCENT}] - {skill['description']}")
+                lines.append(f"  [{Colors.ACCENT}]/{skill['name']}[/{Colors.ACCENT}] - {skill['description']}")
+            console.print("\n".join(lines))
 
         elif subcmd == "run" and len(args) > 1:
             skill_name = args[1]
@@ -527,13 +546,14 @@ class GLMCLI:
             await self._send_message_with_tools(prompt)
         else:
             await self._send_message(prompt)
+        await self.session.aflush()
 
         return True
 
     async def _send_message(self, message: str):
         """Send message to GLM and display response (no tools)"""
         # Add user message to session
-        self.session.add_message("user", message)
+        await self.session.aadd_message("user", message)
 
         # Prepare messages for API
         messages = self.session.get_messages_for_api()
@@ -560,7 +580,7 @@ class GLMCLI:
                     display.stop()
                     print_warning("\nCancelled")
                     # Remove the user message if cancelled
-                    self.session.rewind(1)
+                    await self.session.arewind(1)
                     return
 
                 full_response += chunk
@@ -570,17 +590,17 @@ class GLMCLI:
             console.print()  # New line after response
 
             # Add assistant response to session
-            self.session.add_message("assistant", full_response)
+            await self.session.aadd_message("assistant", full_response)
 
         except GLMAPIError as e:
             display.stop()
             print_error(f"API Error: {e}")
             # Remove the user message on error
-            self.session.rewind(1)
+            await self.session.arewind(1)
         except Exception as e:
             display.stop()
             print_error(f"Error: {e}")
-            self.session.rewind(1)
+            await self.session.arewind(1)
 
     def _is_intent_only_response(self, text: str) -> bool:
         """응답이 의도만 표현하고 실제 내용이 없는지 확인"""
@@ -655,7 +675,7 @@ class GLMCLI:
     async def _send_message_with_tools(self, message: str):
         """Send message to GLM with tool support"""
         # Add user message to session
-        self.session.add_message("user", message)
+        await self.session.aadd_message("user", message)
 
         # Get available tools
         tools = self.tool_executor.get_all_tools()
@@ -733,7 +753,7 @@ class GLMCLI:
 
                         if report_text:
                             console.print(f"\n{report_text}")
-                            self.session.add_message("assistant", report_text)
+                            await self.session.aadd_message("assistant", report_text)
 
                         # 완료 통계 표시
                         if total_tool_calls > 0:
@@ -742,7 +762,7 @@ class GLMCLI:
 
                     # 정상적인 응답
                     if text_parts:
-                        self.session.add_message("assistant", final_text)
+                        await self.session.aadd_message("assistant", final_text)
 
                     # 완료 통계 표시 (도구 사용 시에만)
                     if total_tool_calls > 0:
@@ -822,19 +842,18 @@ class GLMCLI:
 
                 if final_text:
                     console.print(f"\n{final_text}")
-                    self.session.add_message("assistant", final_text)
+                    await self.session.aadd_message("assistant", final_text)
 
                 # 완료 통계 표시
                 console.print(f"\n[dim]━━━ 📊 도구 사용 통계: {total_tool_calls}회 호출, {max_iterations}회 반복 (한도 도달) ━━━[/dim]")
 
         except GLMAPIError as e:
             print_error(f"API Error: {e}")
-            self.session.rewind(1)
+            await self.session.arewind(1)
         except Exception as e:
             print_error(f"Error: {e}")
-            import traceback
             traceback.print_exc()
-            self.session.rewind(1)
+            await self.session.arewind(1)
 
     async def run_interactive(self):
         """Run the interactive CLI loop"""
@@ -849,9 +868,9 @@ class GLMCLI:
         while self.running:
             try:
                 # Get user input using async prompt (more efficient than run_in_executor)
-                prompt_text = '❯ ' if not self.enable_tools else '🔧❯ '
+                prompt_tokens = self._tool_prompt_tokens if self.enable_tools else self._prompt_tokens
                 user_input = await self.prompt_session.prompt_async(
-                    [('class:prompt', prompt_text)],
+                    prompt_tokens,
                     multiline=False,
                 )
 
@@ -1058,6 +1077,13 @@ async def main():
 
 def run():
     """Entry point for the CLI"""
+    # Use libuv-backed event loop when available (optional dependency)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -1,19 +1,92 @@
 """Session and history management for GLM CLI"""
 
+import asyncio
+import atexit
+import functools
 import json
 import os
+import re
 import time
 import uuid
+import weakref
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, TextIO, Tuple
 
 from config import config
 
+try:
+    import orjson
+except ImportError:  # Optional dependency - fall back to stdlib json
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency - message logs fall back to JSONL
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency - compressed snapshots unavailable
+    zstandard = None
+
+ZSTD_LEVEL = 3
+
+# Sessions whose metadata write was deferred by add_message; flushed at exit
+_dirty_sessions: "weakref.WeakSet[Session]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_dirty_sessions() -> None:
+    """Write metadata for sessions that still have a deferred save"""
+    for session in list(_dirty_sessions):
+        session.flush()
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """Serialize session data to indented UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(raw: bytes) -> Dict[str, Any]:
+    """Deserialize session data from JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps_line(data: Dict[str, Any]) -> bytes:
+    """Serialize a record as a single compact JSON line (for append-only logs)"""
+    if orjson is not None:
+        return orjson.dumps(data) + b"\n"
+    return json.dumps(data, ensure_ascii=False).encode('utf-8') + b"\n"
+
+
+def _write_snapshot(path: Path, data: bytes) -> None:
+    """Write an exported session snapshot, compressing when the path ends in .zst"""
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise IOError("zstandard is required to write compressed sessions")
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    path.write_bytes(data)
+
+
+def _count_lines(path: Path) -> int:
+    """Count non-empty lines in a file without decoding it"""
+    try:
+        with open(path, 'rb') as f:
+            return sum(1 for line in f if line.strip())
+    except IOError:
+        return 0
+
 
 class Message:
     """A single message in the conversation"""
 
+    __slots__ = ('role', 'content', 'timestamp')
+
     def __init__(self, role: str, content: str, timestamp: Optional[float] = None):
         self.role = role
         self.content = content
@@ -40,35 +113,83 @@ class Message:
 
 
 class Session:
-    """Manages a conversation session"""
+    """Manages a conversation session
+
+    On-disk layout (one directory per session):
+        sessions/<id>/meta.json         session metadata (rewritten on change)
+        sessions/<id>/messages.msgpack  append-only message log, one MessagePack
+                                        object per message (when msgpack is installed)
+        sessions/<id>/messages.jsonl    append-only message log, one JSON object per line
+                                        (fallback without msgpack)
+
+    A session keeps the log format it was created with. Use export_json()
+    for a human-readable copy.
+
+    Legacy single-file sessions (sessions/<id>.json) are still readable and
+    are migrated to the directory layout when loaded.
+    """
+
+    META_FILE = "meta.json"
+    MESSAGES_FILE = "messages.jsonl"
+    MSGPACK_MESSAGES_FILE = "messages.msgpack"
+    SAVE_INTERVAL = 0.5  # Minimum seconds between metadata writes from add_message
 
     def __init__(self, session_id: Optional[str] = None):
         self.session_id = session_id or str(uuid.uuid4())[:8]
         self.messages: List[Message] = []
+        self.message_count = 0  # Persisted in metadata so listings never touch the message log
+        self._api_messages: List[Dict[str, str]] = []  # API-format view kept in step with messages
         self.created_at = time.time()
         self.updated_at = time.time()
         self.model = config.model
         self.cwd = os.getcwd()
+        self.log_format = "msgpack" if msgpack is not None else "jsonl"
+        self._dirty = False
+        self._last_save = 0.0
 
     @property
-    def session_file(self) -> Path:
-        """Get the session file path"""
-        return config.sessions_dir / f"{self.session_id}.json"
+    def session_dir(self) -> Path:
+        """Get the session directory path"""
+        return config.sessions_dir / self.session_id
+
+    @property
+    def meta_file(self) -> Path:
+        """Get the session metadata file path"""
+        return self.session_dir / self.META_FILE
+
+    @property
+    def messages_file(self) -> Path:
+        """Get the append-only message log path"""
+        if self.log_format == "msgpack":
+            return self.session_dir / self.MSGPACK_MESSAGES_FILE
+        return self.session_dir / self.MESSAGES_FILE
 
     def add_message(self, role: str, content: str) -> Message:
         """Add a message to the session"""
         msg = Message(role, content)
         self.messages.append(msg)
+        self._api_messages.append(msg.to_api_format())
+        self.message_count += 1
         self.updated_at = time.time()
-        self.save()
+        self._append_message(msg)
+        # The log append is durable; metadata is debounced and flushed at exit
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self.SAVE_INTERVAL:
+            self.save()
+        else:
+            _dirty_sessions.add(self)
         return msg
 
     def get_messages_for_api(self, max_messages: Optional[int] = None) -> List[Dict[str, str]]:
         """Get messages in API format"""
-        messages = self.messages
+        # Slicing returns a new list (callers prepend system prompts) but shares the dicts
         if max_messages:
-            messages = messages[-max_messages:]
-        return [m.to_api_format() for m in messages]
+            return self._api_messages[-max_messages:]
+        return self._api_messages[:]
+
+    def _rebuild_views(self):
+        """Rebuild the API-format view after messages were replaced"""
+        self._api_messages = [m.to_api_format() for m in self.messages]
 
     def compact(self, keep_last: int = 10):
         """Compact the session by keeping only recent messages"""
@@ -82,6 +203,9 @@ class Session:
             recent_messages = self.messages[-keep_last:]
             context_msg = Message("user", f"--- {summary} ---\n계속해서 대화해주세요.")
             self.messages = [context_msg] + recent_messages
+            self.message_count = len(self.messages)
+            self._rebuild_views()
+            self._rewrite_messages()
             self.save()
             return len(old_messages)
         return 0
@@ -90,6 +214,9 @@ class Session:
         """Remove the last N messages (usually user + assistant pair)"""
         if len(self.messages) >= count:
             self.messages = self.messages[:-count]
+            del self._api_messages[-count:]
+            self.message_count -= count
+            self._rewrite_messages()
             self.save()
             return count
         return 0
@@ -97,10 +224,92 @@ class Session:
     def clear(self):
         """Clear all messages"""
         self.messages = []
+        self._api_messages = []
+        self.message_count = 0
+        self._rewrite_messages()
         self.save()
 
+    # Async variants run the blocking file I/O in a worker thread so the
+    # event loop keeps servicing tool calls and streaming while we write.
+
+    async def aadd_message(self, role: str, content: str) -> Message:
+        """Add a message without blocking the event loop"""
+        return await asyncio.to_thread(self.add_message, role, content)
+
+    async def acompact(self, keep_last: int = 10) -> int:
+        """Compact the session without blocking the event loop"""
+        return await asyncio.to_thread(self.compact, keep_last)
+
+    async def arewind(self, count: int = 2) -> int:
+        """Rewind the session without blocking the event loop"""
+        return await asyncio.to_thread(self.rewind, count)
+
+    async def aclear(self):
+        """Clear the session without blocking the event loop"""
+        await asyncio.to_thread(self.clear)
+
+    async def asave(self):
+        """Save session metadata without blocking the event loop"""
+        await asyncio.to_thread(self.save)
+
+    async def aflush(self):
+        """Write deferred metadata without blocking the event loop"""
+        if self._dirty:
+            await asyncio.to_thread(self.flush)
+
+    def flush(self):
+        """Write metadata if add_message deferred it"""
+        if self._dirty:
+            self.save()
+
     def save(self):
-        """Save session to file"""
+        """Save session metadata to file
+
+        Messages are persisted separately by appending to the message log,
+        so this only rewrites the (small) metadata file.
+        """
+        data = {
+            "session_id": self.session_id,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "model": self.model,
+            "cwd": self.cwd,
+            "message_count": self.message_count,
+        }
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.meta_file.write_bytes(_dumps(data))
+        self._dirty = False
+        self._last_save = time.monotonic()
+        _dirty_sessions.discard(self)
+
+    def _append_message(self, msg: Message):
+        """Append a single message to the message log"""
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.messages_file, 'ab') as f:
+            f.write(self._encode_record(msg.to_dict()))
+
+    def _rewrite_messages(self):
+        """Rewrite the message log from the in-memory message list"""
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.messages_file.write_bytes(
+            b"".join(self._encode_record(m.to_dict()) for m in self.messages)
+        )
+
+    def _encode_record(self, data: Dict[str, Any]) -> bytes:
+        """Encode one message record in this session's log format"""
+        if self.log_format == "msgpack":
+            return msgpack.packb(data, use_bin_type=True)
+        return _dumps_line(data)
+
+    def export_json(self, path: Optional[Path] = None) -> Path:
+        """Export the full session (metadata + messages) as indented JSON
+
+        A path ending in .zst writes a zstd-compressed snapshot (requires
+        zstandard). Exports are standalone copies for reading or sharing, not
+        resumable sessions.
+        """
+        if path is None:
+            path = Path.cwd() / f"glm-session-{self.session_id}.json"
         data = {
             "session_id": self.session_id,
             "created_at": self.created_at,
@@ -109,113 +318,291 @@ class Session:
             "cwd": self.cwd,
             "messages": [m.to_dict() for m in self.messages],
         }
-        with open(self.session_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        _write_snapshot(path, _dumps(data))
+        return path
 
     @classmethod
     def load(cls, session_id: str) -> Optional["Session"]:
         """Load a session from file"""
-        session_file = config.sessions_dir / f"{session_id}.json"
-        if not session_file.exists():
-            return None
+        session_dir = config.sessions_dir / session_id
+        if (session_dir / cls.META_FILE).exists():
+            return cls._load_dir(session_dir)
+
+        legacy_file = config.sessions_dir / f"{session_id}.json"
+        if legacy_file.exists():
+            return cls._load_legacy(legacy_file)
+
+        return None
 
+    @classmethod
+    def _load_dir(cls, session_dir: Path) -> Optional["Session"]:
+        """Load a session stored in the directory layout"""
         try:
-            with open(session_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            session = cls(session_id=data["session_id"])
-            session.created_at = data["created_at"]
-            session.updated_at = data["updated_at"]
-            session.model = data.get("model", config.model)
-            session.cwd = data.get("cwd", os.getcwd())
-            session.messages = [Message.from_dict(m) for m in data["messages"]]
+            data = _loads((session_dir / cls.META_FILE).read_bytes())
+            session = cls._from_meta(data)
+
+            msgpack_file = session_dir / cls.MSGPACK_MESSAGES_FILE
+            messages_file = session_dir / cls.MESSAGES_FILE
+            if msgpack_file.exists():
+                if msgpack is None:
+                    return None  # Written by an install with msgpack; cannot decode here
+                session.log_format = "msgpack"
+                with open(msgpack_file, 'rb') as f:
+                    try:
+                        for record in msgpack.Unpacker(f, raw=False):
+                            session.messages.append(Message.from_dict(record))
+                    except ValueError:
+                        pass  # Partial trailing write from an interrupted append
+            elif messages_file.exists():
+                session.log_format = "jsonl"
+                with open(messages_file, 'rb') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            session.messages.append(Message.from_dict(_loads(line)))
+                        except ValueError:
+                            continue  # Partial trailing write from an interrupted append
+            session.message_count = len(session.messages)
+            session._rebuild_views()
             return session
         except (json.JSONDecodeError, KeyError, IOError):
             return None
 
     @classmethod
-    def get_latest(cls, cwd: Optional[str] = None) -> Optional["Session"]:
-        """Get the most recent session, optionally filtered by cwd"""
-        sessions_dir = config.sessions_dir
-        if not sessions_dir.exists():
+    def _load_legacy(cls, session_file: Path) -> Optional["Session"]:
+        """Load a legacy single-file session and migrate it to the directory layout"""
+        try:
+            data = _loads(session_file.read_bytes())
+            session = cls._from_meta(data)
+            session.messages = [Message.from_dict(m) for m in data["messages"]]
+            session.message_count = len(session.messages)
+            session._rebuild_views()
+        except (json.JSONDecodeError, KeyError, IOError):
             return None
 
-        session_files = list(sessions_dir.glob("*.json"))
-        if not session_files:
-            return None
+        try:
+            session._rewrite_messages()
+            session.save()
+            session_file.unlink()
+        except OSError:
+            pass  # Keep the legacy file; it is still loadable next time
 
-        # Sort by modification time
-        session_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+        return session
+
+    @classmethod
+    def _from_meta(cls, data: Dict[str, Any]) -> "Session":
+        """Create a session (without messages) from metadata"""
+        session = cls(session_id=data["session_id"])
+        session.created_at = data["created_at"]
+        session.updated_at = data["updated_at"]
+        session.model = data.get("model", config.model)
+        session.cwd = data.get("cwd", os.getcwd())
+        return session
+
+    @classmethod
+    def _session_files(cls) -> List[Tuple[Path, int]]:
+        """List (path, mtime_ns) for session metadata and legacy session files, newest first"""
+        sessions_dir = config.sessions_dir
+        try:
+            dir_mtime = sessions_dir.stat().st_mtime_ns
+        except OSError:
+            return []
 
-        for session_file in session_files:
+        # Directory entries only change when sessions are created, migrated or
+        # removed, all of which bump the directory's own mtime.
+        cache_key = str(sessions_dir)
+        cached = _listing_cache.get(cache_key)
+        if cached and cached[0] == dir_mtime:
+            paths = cached[1]
+        else:
+            paths = list(sessions_dir.glob(f"*/{cls.META_FILE}"))
+            paths.extend(sessions_dir.glob("*.json"))
+            _listing_cache[cache_key] = (dir_mtime, paths)
+
+        files = []
+        for path in paths:
             try:
-                with open(session_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                files.append((path, path.stat().st_mtime_ns))
+            except OSError:
+                continue
+
+        # Sort by modification time
+        files.sort(key=lambda f: f[1], reverse=True)
+        return files
 
-                # Filter by cwd if specified
-                if cwd and data.get("cwd") != cwd:
-                    continue
+    @classmethod
+    def get_latest(cls, cwd: Optional[str] = None) -> Optional["Session"]:
+        """Get the most recent session, optionally filtered by cwd"""
+        for session_file, mtime_ns in cls._session_files():
+            header = _read_header(str(session_file), mtime_ns)
+            if header is None:
+                continue
 
-                return cls.load(data["session_id"])
-            except (json.JSONDecodeError, IOError):
+            # Filter by cwd if specified
+            if cwd and header["cwd"] != cwd:
                 continue
 
+            return cls.load(header["session_id"])
+
         return None
 
     @classmethod
     def list_sessions(cls, limit: int = 10) -> List[Dict[str, Any]]:
         """List recent sessions"""
-        sessions_dir = config.sessions_dir
-        if not sessions_dir.exists():
-            return []
-
-        session_files = list(sessions_dir.glob("*.json"))
-        session_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-
         sessions = []
-        for session_file in session_files[:limit]:
-            try:
-                with open(session_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                sessions.append({
-                    "session_id": data["session_id"],
-                    "created_at": datetime.fromtimestamp(data["created_at"]).strftime("%Y-%m-%d %H:%M"),
-                    "updated_at": datetime.fromtimestamp(data["updated_at"]).strftime("%Y-%m-%d %H:%M"),
-                    "messages": len(data.get("messages", [])),
-                    "cwd": data.get("cwd", ""),
-                })
-            except (json.JSONDecodeError, IOError):
+        for session_file, mtime_ns in cls._session_files()[:limit]:
+            header = _read_header(str(session_file), mtime_ns)
+            if header is None:
                 continue
+            sessions.append({
+                "session_id": header["session_id"],
+                "created_at": datetime.fromtimestamp(header["created_at"]).strftime("%Y-%m-%d %H:%M"),
+                "updated_at": datetime.fromtimestamp(header["updated_at"]).strftime("%Y-%m-%d %H:%M"),
+                "messages": header["messages"],
+                "cwd": header["cwd"],
+            })
 
         return sessions
 
 
+# Session directory listings, keyed by directory path -> (dir mtime_ns, paths)
+_listing_cache: Dict[str, Tuple[int, List[Path]]] = {}
+
+
+@functools.lru_cache(maxsize=256)
+def _read_header(path: str, mtime_ns: int) -> Optional[Dict[str, Any]]:
+    """Read the summary fields of a session file
+
+    Cached per (path, mtime_ns), so a rewritten file is re-read automatically.
+    """
+    return _load_meta(Path(path))
+
+
+# Legacy single-file sessions are written with the header fields first and the
+# (potentially huge) messages list last, so the header fields are found in the
+# first block without decoding the rest.
+_LEGACY_HEAD_SIZE = 1024
+_LEGACY_STRING_FIELD_RE = re.compile(rb'"(session_id|cwd)":\s*("(?:[^"\\]|\\.)*")')
+_LEGACY_NUMBER_FIELD_RE = re.compile(rb'"(created_at|updated_at)":\s*(-?[0-9][0-9.eE+-]*)')
+_LEGACY_MESSAGE_MARKER = b'"role":'
+
+
+def _load_meta(session_file: Path) -> Optional[Dict[str, Any]]:
+    """Load only the summary fields of a session file, without decoding messages"""
+    try:
+        if session_file.name == Session.META_FILE:
+            data = _loads(session_file.read_bytes())
+            message_count = data.get("message_count")
+            if message_count is None:
+                message_count = _count_lines(session_file.parent / Session.MESSAGES_FILE)
+            return {
+                "session_id": data["session_id"],
+                "created_at": data["created_at"],
+                "updated_at": data["updated_at"],
+                "cwd": data.get("cwd", ""),
+                "messages": message_count,
+            }
+        return _load_legacy_meta(session_file)
+    except (json.JSONDecodeError, KeyError, IOError):
+        return None
+
+
+def _load_legacy_meta(session_file: Path) -> Dict[str, Any]:
+    """Load summary fields of a legacy single-file session
+
+    Legacy files carry no message count, so the whole file is still read;
+    what is skipped is JSON-decoding the messages. Header
+    fields are pulled from the first block with a regex, and messages are
+    counted by scanning the raw bytes for the per-message "role" key (quotes
+    inside message text are always escaped, so it cannot false-match).
+    Falls back to a full parse if the header is not where we expect it.
+    """
+    raw = session_file.read_bytes()
+    head = raw[:_LEGACY_HEAD_SIZE]
+    fields: Dict[str, Any] = {}
+    for match in _LEGACY_STRING_FIELD_RE.finditer(head):
+        fields.setdefault(match.group(1).decode(), json.loads(match.group(2)))
+    for match in _LEGACY_NUMBER_FIELD_RE.finditer(head):
+        fields.setdefault(match.group(1).decode(), float(match.group(2)))
+
+    if not {"session_id", "created_at", "updated_at", "cwd"} <= fields.keys():
+        data = _loads(raw)
+        return {
+            "session_id": data["session_id"],
+            "created_at": data["created_at"],
+            "updated_at": data["updated_at"],
+            "cwd": data.get("cwd", ""),
+            "messages": len(data.get("messages", [])),
+        }
+
+    return {
+        "session_id": fields["session_id"],
+        "created_at": fields["created_at"],
+        "updated_at": fields["updated_at"],
+        "cwd": fields["cwd"],
+        "messages": raw.count(_LEGACY_MESSAGE_MARKER),
+    }
+
+
+def _tail_lines(path: Path, n: int, chunk_size: int = 16384) -> List[str]:
+    """Return the last n lines of a file, reading backwards from the end
+
+    Only the final chunk is read; the chunk doubles until it holds n complete
+    lines or covers the whole file. n <= 0 returns every line.
+    """
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        while True:
+            start = max(0, size - chunk_size) if n > 0 else 0
+            f.seek(start)
+            lines = f.read(size - start).split(b'\n')
+            if lines and lines[-1] == b'':
+                lines.pop()  # Trailing newline does not start a new line
+            # Unless we read from the start, the first piece may be a partial line
+            if start == 0 or len(lines) > n:
+                break
+            chunk_size *= 2
+
+    if n > 0:
+        lines = lines[-n:]
+    return [line.decode('utf-8', errors='replace') for line in lines]
+
+
 class HistoryManager:
     """Manages command history"""
 
     def __init__(self):
         self.history_file = config.history_dir / "commands.txt"
+        self._fh: Optional[TextIO] = None  # Long-lived, line-buffered append handle
+        atexit.register(self._close)
 
     def add(self, command: str):
         """Add a command to history"""
-        with open(self.history_file, 'a', encoding='utf-8') as f:
-            f.write(f"{command}\n")
+        if self._fh is None:
+            self._fh = open(self.history_file, 'a', encoding='utf-8', buffering=1)
+        self._fh.write(f"{command}\n")
 
     def get_all(self, limit: int = 100) -> List[str]:
         """Get command history"""
         if not self.history_file.exists():
             return []
 
-        with open(self.history_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        return [line.strip() for line in lines[-limit:]]
+        lines = _tail_lines(self.history_file, limit)
+        return [line.strip() for line in lines]
 
     def clear(self):
         """Clear command history"""
+        self._close()
         if self.history_file.exists():
             self.history_file.unlink()
 
+    def _close(self):
+        """Close the append handle (reopened on next add)"""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
 
 # Global instances
 history_manager = HistoryManager()
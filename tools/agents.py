@@ -3,15 +3,27 @@
 Lightweight agent system with 8 core agents.
 """
 
+import functools
 import os
+import pickle
 import re
+import sys
 import yaml
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
+# Parsed agent files, reused across runs while the source files are unchanged
+AGENT_CACHE_FILE = Path.home() / ".glm" / "cache" / "agents.pickle"
 
-@dataclass
+# YAML frontmatter followed by the markdown body
+_FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---\n(.*)$', re.DOTALL)
+
+# Prefer the libyaml C loader; fall back to the pure-Python loader
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@dataclass(slots=True)
 class Agent:
     """Agent definition"""
     name: str
@@ -27,6 +39,10 @@ class AgentRegistry:
     def __init__(self):
         self.agents: Dict[str, Agent] = {}
         self._loaded = False
+        # Keyword routing index, rebuilt lazily whenever agents change
+        self._keyword_regex: Optional[re.Pattern] = None
+        self._keyword_rank: Dict[str, int] = {}
+        self._keyword_agents: List[Agent] = []
 
     def load_agents(self, agents_dir: Optional[str] = None) -> None:
         """Load agents from directory
@@ -55,31 +71,116 @@ class AgentRegistry:
         if builtin_dir.exists():
             search_paths.append(builtin_dir)
 
-        # Load from all paths
-        for dir_path in search_paths:
-            if not dir_path.exists():
-                continue
-
-            for agent_file in dir_path.glob("*.md"):
+        agent_files = [
+            agent_file
+            for dir_path in search_paths if dir_path.exists()
+            for agent_file in dir_path.glob("*.md")
+        ]
+        fingerprint = self._fingerprint(agent_files)
+
+        parsed = self._load_cache(fingerprint)
+        if parsed is None:
+            # Load from all paths
+            parsed = {}
+            failed = False
+            for agent_file in agent_files:
                 try:
                     agent = self._parse_agent_file(agent_file)
-                    if agent and agent.name not in self.agents:
-                        self.agents[agent.name] = agent
+                    if agent and agent.name not in parsed:
+                        parsed[agent.name] = agent
                 except Exception as e:
+                    failed = True
                     print(f"Error loading agent {agent_file}: {e}")
 
+            # Only cache clean parses so broken files are reported again next run
+            if not failed:
+                self._save_cache(fingerprint, parsed)
+
+        for name, agent in parsed.items():
+            if name not in self.agents:
+                self.agents[name] = agent
+
+        self.register_builtins()
+
+    def register_builtins(self) -> None:
+        """Register built-in agents not already defined by agent files"""
+        for name, agent in builtin_agents().items():
+            self.agents.setdefault(name, agent)
         self._loaded = True
+        self.invalidate_index()
+
+    def invalidate_index(self) -> None:
+        """Drop the keyword index and cached prompts so they are rebuilt on next use"""
+        self._keyword_regex = None
+        _build_agent_prompt.cache_clear()
+
+    def _build_keyword_index(self) -> None:
+        """Compile all agent keywords into a single regex
+
+        Each keyword is ranked by the position of its (first) agent, and the
+        alternation is ordered by rank. The pattern is a lookahead so every
+        text position is tried, which lets one scan find the best-ranked
+        keyword occurring anywhere in the text -- the same agent the nested
+        agent/keyword loop would pick.
+        """
+        self._keyword_agents = list(self.agents.values())
+        self._keyword_rank = {}
+        for rank, agent in enumerate(self._keyword_agents):
+            for keyword in agent.keywords:
+                self._keyword_rank.setdefault(keyword.lower(), rank)
+
+        if self._keyword_rank:
+            alternation = '|'.join(re.escape(k) for k in self._keyword_rank)
+            self._keyword_regex = re.compile(f'(?=({alternation}))')
+        else:
+            self._keyword_regex = re.compile(r'(?!)')  # Never matches
+
+    @staticmethod
+    def _fingerprint(agent_files: List[Path]) -> Tuple[Tuple[str, int, int], ...]:
+        """Identify the current set of agent files by path, mtime and size"""
+        entries = []
+        for agent_file in agent_files:
+            try:
+                st = agent_file.stat()
+            except OSError:
+                continue
+            entries.append((str(agent_file), st.st_mtime_ns, st.st_size))
+        return tuple(entries)
+
+    @staticmethod
+    def _load_cache(fingerprint: Tuple) -> Optional[Dict[str, "Agent"]]:
+        """Return cached agents if the cache matches the fingerprint"""
+        try:
+            with open(AGENT_CACHE_FILE, 'rb') as f:
+                cached_fingerprint, agents = pickle.load(f)
+        except Exception:
+            return None
+        if cached_fingerprint != fingerprint:
+            return None
+        return agents
+
+    @staticmethod
+    def _save_cache(fingerprint: Tuple, agents: Dict[str, "Agent"]) -> None:
+        """Atomically write the agent cache"""
+        try:
+            AGENT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = AGENT_CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, 'wb') as f:
+                pickle.dump((fingerprint, agents), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, AGENT_CACHE_FILE)
+        except OSError:
+            pass  # Cache is best-effort
 
     def _parse_agent_file(self, file_path: Path) -> Optional[Agent]:
         """Parse agent definition from markdown file"""
         content = file_path.read_text(encoding='utf-8')
 
         # Parse YAML frontmatter
-        frontmatter_match = re.match(r'^---\n(.*?)\n---\n(.*)$', content, re.DOTALL)
+        frontmatter_match = _FRONTMATTER_RE.match(content)
         if not frontmatter_match:
             return None
 
-        frontmatter = yaml.safe_load(frontmatter_match.group(1))
+        frontmatter = yaml.load(frontmatter_match.group(1), Loader=_YamlLoader)
         body = frontmatter_match.group(2).strip()
 
         name = frontmatter.get('name', file_path.stem)
@@ -112,40 +213,54 @@ class AgentRegistry:
     def find_agent_by_keyword(self, text: str) -> Optional[Agent]:
         """Find agent matching keywords in text"""
         self.load_agents()
-        text_lower = text.lower()
-
-        for agent in self.agents.values():
-            for keyword in agent.keywords:
-                if keyword.lower() in text_lower:
-                    return agent
-
-        return None
+        if self._keyword_regex is None:
+            self._build_keyword_index()
+
+        best_rank = None
+        for match in self._keyword_regex.finditer(text.lower()):
+            rank = self._keyword_rank[match.group(1)]
+            if best_rank is None or rank < best_rank:
+                best_rank = rank
+                if rank == 0:
+                    break
+
+        if best_rank is None:
+            return None
+        return self._keyword_agents[best_rank]
 
     def get_agent_system_prompt(self, name: str) -> Optional[str]:
         """Get system prompt for agent"""
         agent = self.get_agent(name)
         if agent:
-            return f"""You are {agent.name}.
+            return _build_agent_prompt(agent.name, agent.description, agent.system_prompt)
+        return None
+
+
+@functools.lru_cache(maxsize=32)
+def _build_agent_prompt(name: str, description: str, system_prompt: str) -> str:
+    """Assemble the full system prompt for an agent"""
+    return f"""You are {name}.
 
-{agent.description}
+{description}
 
-{agent.system_prompt}
+{system_prompt}
 """
-        return None
 
 
 # Global registry
 agent_registry = AgentRegistry()
 
 
-# Built-in agents (lightweight versions)
-BUILTIN_AGENTS = {
-    "code-reviewer": Agent(
-        name="code-reviewer",
-        description="Expert code reviewer for quality and security",
-        keywords=["review", "리뷰", "코드리뷰", "검토"],
-        tools=["read_file", "glob", "grep", "bash"],
-        system_prompt="""You are a senior code reviewer.
+@functools.cache
+def builtin_agents() -> Dict[str, Agent]:
+    """Built-in agents (lightweight versions), built on first use"""
+    agents = {
+        "code-reviewer": Agent(
+            name="code-reviewer",
+            description="Expert code reviewer for quality and security",
+            keywords=["review", "리뷰", "코드리뷰", "검토"],
+            tools=["read_file", "glob", "grep", "bash"],
+            system_prompt="""You are a senior code reviewer.
 
 ## Review Focus
 1. **Security**: SQL injection, XSS, CSRF, auth flaws
@@ -158,13 +273,13 @@ BUILTIN_AGENTS = {
 - Issues: List with severity (Critical/High/Medium/Low)
 - Suggestions: Actionable improvements
 """
-    ),
-    "backend-dev": Agent(
-        name="backend-dev",
-        description="Backend API and server-side specialist",
-        keywords=["backend", "백엔드", "api", "서버"],
-        tools=["read_file", "write_file", "edit_file", "bash", "glob", "grep"],
-        system_prompt="""You are a senior backend developer.
+        ),
+        "backend-dev": Agent(
+            name="backend-dev",
+            description="Backend API and server-side specialist",
+            keywords=["backend", "백엔드", "api", "서버"],
+            tools=["read_file", "write_file", "edit_file", "bash", "glob", "grep"],
+            system_prompt="""You are a senior backend developer.
 
 ## Expertise
 - **Runtime**: Node.js, Python, Deno
@@ -178,13 +293,13 @@ BUILTIN_AGENTS = {
 - Database transaction management
 - Authentication/Authorization
 """
-    ),
-    "frontend-dev": Agent(
-        name="frontend-dev",
-        description="Frontend UI/UX specialist",
-        keywords=["frontend", "프론트엔드", "ui", "react", "vue"],
-        tools=["read_file", "write_file", "edit_file", "bash", "glob", "grep"],
-        system_prompt="""You are a senior frontend developer.
+        ),
+        "frontend-dev": Agent(
+            name="frontend-dev",
+            description="Frontend UI/UX specialist",
+            keywords=["frontend", "프론트엔드", "ui", "react", "vue"],
+            tools=["read_file", "write_file", "edit_file", "bash", "glob", "grep"],
+            system_prompt="""You are a senior frontend developer.
 
 ## Expertise
 - **Frameworks**: React, Vue, Svelte, Next.js
@@ -198,13 +313,13 @@ BUILTIN_AGENTS = {
 - Performance optimization
 - Responsive design
 """
-    ),
-    "devops-eng": Agent(
-        name="devops-eng",
-        description="DevOps and infrastructure specialist",
-        keywords=["devops", "deploy", "배포", "docker", "ci/cd"],
-        tools=["read_file", "write_file", "edit_file", "bash", "glob", "grep"],
-        system_prompt="""You are a DevOps engineer.
+        ),
+        "devops-eng": Agent(
+            name="devops-eng",
+            description="DevOps and infrastructure specialist",
+            keywords=["devops", "deploy", "배포", "docker", "ci/cd"],
+            tools=["read_file", "write_file", "edit_file", "bash", "glob", "grep"],
+            system_prompt="""You are a DevOps engineer.
 
 ## Expertise
 - **Containers**: Docker, Podman, containerd
@@ -218,13 +333,13 @@ BUILTIN_AGENTS = {
 - Security scanning
 - Monitoring and logging
 """
-    ),
-    "doc-writer": Agent(
-        name="doc-writer",
-        description="Technical documentation specialist",
-        keywords=["docs", "문서", "readme", "documentation"],
-        tools=["read_file", "write_file", "edit_file", "glob", "grep"],
-        system_prompt="""You are a technical writer.
+        ),
+        "doc-writer": Agent(
+            name="doc-writer",
+            description="Technical documentation specialist",
+            keywords=["docs", "문서", "readme", "documentation"],
+            tools=["read_file", "write_file", "edit_file", "glob", "grep"],
+            system_prompt="""You are a technical writer.
 
 ## Documentation Types
 - README files
@@ -238,13 +353,13 @@ BUILTIN_AGENTS = {
 - Visual diagrams
 - Versioning
 """
-    ),
-    "db-architect": Agent(
-        name="db-architect",
-        description="Database design and optimization specialist",
-        keywords=["database", "db", "sql", "schema", "데이터베이스"],
-        tools=["read_file", "write_file", "edit_file", "bash", "glob", "grep"],
-        system_prompt="""You are a database architect.
+        ),
+        "db-architect": Agent(
+            name="db-architect",
+            description="Database design and optimization specialist",
+            keywords=["database", "db", "sql", "schema", "데이터베이스"],
+            tools=["read_file", "write_file", "edit_file", "bash", "glob", "grep"],
+            system_prompt="""You are a database architect.
 
 ## Expertise
 - **Relational**: PostgreSQL, MySQL, SQLite
@@ -258,13 +373,13 @@ BUILTIN_AGENTS = {
 - Migration management
 - Backup and recovery
 """
-    ),
-    "test-runner": Agent(
-        name="test-runner",
-        description="Test automation and quality assurance",
-        keywords=["test", "테스트", "testing", "coverage"],
-        tools=["read_file", "write_file", "edit_file", "bash", "glob", "grep"],
-        system_prompt="""You are a test automation engineer.
+        ),
+        "test-runner": Agent(
+            name="test-runner",
+            description="Test automation and quality assurance",
+            keywords=["test", "테스트", "testing", "coverage"],
+            tools=["read_file", "write_file", "edit_file", "bash", "glob", "grep"],
+            system_prompt="""You are a test automation engineer.
 
 ## Testing Types
 - Unit tests
@@ -282,13 +397,13 @@ BUILTIN_AGENTS = {
 - High coverage on critical paths
 - Fast feedback loops
 """
-    ),
-    "orchestrator": Agent(
-        name="orchestrator",
-        description="Task coordinator and workflow manager",
-        keywords=["orchestrate", "coordinate", "조율", "관리"],
-        tools=["read_file", "glob", "grep", "bash"],
-        system_prompt="""You are a project orchestrator.
+        ),
+        "orchestrator": Agent(
+            name="orchestrator",
+            description="Task coordinator and workflow manager",
+            keywords=["orchestrate", "coordinate", "조율", "관리"],
+            tools=["read_file", "glob", "grep", "bash"],
+            system_prompt="""You are a project orchestrator.
 
 ## Responsibilities
 - Break down complex tasks
@@ -303,16 +418,15 @@ BUILTIN_AGENTS = {
 4. Review and integrate
 5. Validate output
 """
-    ),
-}
+        ),
+    }
+    # Intern the large prompt strings so prompt caches hash and compare them cheaply
+    for agent in agents.values():
+        agent.description = sys.intern(agent.description)
+        agent.system_prompt = sys.intern(agent.system_prompt)
+    return agents
 
 
 def register_builtin_agents():
-    """Register built-in agents"""
-    for name, agent in BUILTIN_AGENTS.items():
-        agent_registry.agents[name] = agent
-    agent_registry._loaded = True
-
-
-# Auto-register built-in agents
-register_builtin_agents()
+    """Register built-in agents into the global registry"""
+    agent_registry.register_builtins()
@@ -18,7 +18,7 @@ class ToolParameterType(str, Enum):
     OBJECT = "object"
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolParameter:
     """Tool parameter definition"""
     name: str
@@ -29,7 +29,7 @@ class ToolParameter:
     enum: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Result of tool execution"""
     success: bool
@@ -63,7 +63,14 @@ class Tool(ABC):
         pass
 
     def get_schema(self) -> Dict[str, Any]:
-        """Get Anthropic-compatible tool schema"""
+        """Get Anthropic-compatible tool schema (built once per instance)"""
+        schema = self.__dict__.get('_schema')
+        if schema is None:
+            schema = self._schema = self._build_schema()
+        return schema
+
+    def _build_schema(self) -> Dict[str, Any]:
+        """Build the tool schema from name, description and parameters"""
         properties = {}
         required = []
 
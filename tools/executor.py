@@ -5,16 +5,20 @@ Handles tool execution loop and result formatting.
 
 import json
 from typing import Any, Dict, List, Optional, Tuple
-from rich.console import Console
 from rich.panel import Panel
 from rich.syntax import Syntax
 
+from ui import console
+
 from .registry import tool_registry
 from .local import register_local_tools
 from .mcp_client import mcp_client
 from .base import ToolResult
 
-console = Console()
+# Namespaced tools ("<prefix>__<name>") are routed by prefix; everything else is local
+PREFIX_DISPATCH = {
+    "mcp": mcp_client.call_tool,
+}
 
 
 class ToolExecutor:
@@ -23,6 +27,7 @@ class ToolExecutor:
     def __init__(self):
         self.enabled = True
         self._initialized = False
+        self._all_tools_cache: Optional[List[Dict[str, Any]]] = None
 
     async def initialize(self) -> None:
         """Initialize tool system"""
@@ -36,26 +41,39 @@ class ToolExecutor:
         mcp_client.load_config()
 
         self._initialized = True
+        self._invalidate_tools()
+
+    def _invalidate_tools(self) -> None:
+        """Drop cached tool schemas (call whenever the tool set changes)"""
+        self._all_tools_cache = None
 
     def get_all_tools(self) -> List[Dict[str, Any]]:
-        """Get all available tool schemas"""
-        schemas = tool_registry.get_all_schemas()
-        schemas.extend(mcp_client.get_all_schemas())
-        return schemas
+        """Get all available tool schemas
+
+        The list is cached and shared between calls; callers must not mutate it.
+        """
+        if self._all_tools_cache is None:
+            self._all_tools_cache = tool_registry.get_all_schemas() + mcp_client.get_all_schemas()
+        return self._all_tools_cache
 
     async def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> ToolResult:
         """Execute a single tool"""
-        # Check if it's an MCP tool
-        if tool_name.startswith("mcp__"):
-            return await mcp_client.call_tool(tool_name, arguments)
+        prefix, sep, _ = tool_name.partition("__")
+        handler = PREFIX_DISPATCH.get(prefix) if sep else None
+        if handler is not None:
+            return await handler(tool_name, arguments)
 
         # Execute local tool
         return await tool_registry.execute(tool_name, **arguments)
 
     def display_tool_use(self, tool_name: str, arguments: Dict[str, Any]) -> None:
         """Display tool use to user"""
-        args_str = json.dumps(arguments, indent=2, ensure_ascii=False)
         console.print(f"\n[bold cyan]🔧 Using tool:[/bold cyan] {tool_name}")
+        # The str() lengths are a lower bound on the JSON size, so large
+        # arguments (file contents, commands) are never serialized just to be hidden
+        if sum(len(str(k)) + len(str(v)) for k, v in arguments.items()) >= 200:
+            return
+        args_str = json.dumps(arguments, indent=2, ensure_ascii=False)
         if len(args_str) < 200:
             console.print(f"[dim]{args_str}[/dim]")
 
@@ -80,11 +98,15 @@ class ToolExecutor:
 
     async def connect_mcp_server(self, server_name: str) -> bool:
         """Connect to an MCP server"""
-        return await mcp_client.connect(server_name)
+        try:
+            return await mcp_client.connect(server_name)
+        finally:
+            self._invalidate_tools()
 
     async def disconnect_all_mcp(self) -> None:
         """Disconnect from all MCP servers"""
         await mcp_client.disconnect_all()
+        self._invalidate_tools()
 
     def list_mcp_servers(self) -> List[str]:
         """List available MCP servers"""
@@ -4,14 +4,213 @@ Implements Read, Write, Bash, Glob, Grep tools.
 """
 
 import asyncio
+import fnmatch
+import functools
 import os
-import glob as glob_module
+import io
+import json
+import mmap
 import re
+import secrets
+import shlex
+import shutil
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Iterator, Optional, List, Set, Tuple
 from .base import Tool, ToolResult, ToolParameter, ToolParameterType
 
 
+# Resolved once; tools expand "~" and default to the cwd on every call.
+# The CLI never changes directory, so the cwd is cached too.
+_HOME = os.path.expanduser('~')
+
+
+def _expand(path: str) -> str:
+    """Expand a leading ~ like os.path.expanduser, using the cached home directory"""
+    if not path.startswith('~'):
+        return path
+    if path == '~' or path.startswith('~/'):
+        return _HOME + path[1:]
+    return os.path.expanduser(path)  # ~otheruser
+
+
+@functools.cache
+def _cwd() -> str:
+    """Current working directory, looked up once"""
+    return os.getcwd()
+
+
+def _signal_group(process: asyncio.subprocess.Process, sig: int) -> None:
+    """Signal a command's whole process group (its shell and any children)"""
+    try:
+        os.killpg(process.pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+# Shared pool for blocking file I/O so tools don't stall the event loop
+_io_executor = ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 4,
+                                  thread_name_prefix="glm-io")
+
+
+async def _run_blocking(func, *args) -> Any:
+    """Run a blocking function on the I/O pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_executor, functools.partial(func, *args))
+
+
+# Files larger than this are memory-mapped instead of read into Python strings
+MMAP_THRESHOLD = 64 * 1024
+
+
+def _mmap_count(path: str, needle: bytes) -> int:
+    """Count non-overlapping occurrences of needle in a memory-mapped file"""
+    count = 0
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = mm.find(needle)
+        while pos != -1:
+            count += 1
+            pos = mm.find(needle, pos + len(needle))
+    return count
+
+
+# Content larger than this is written with raw os.write calls in chunks
+LARGE_WRITE_THRESHOLD = 1024 * 1024
+WRITE_CHUNK_SIZE = 1024 * 1024
+
+
+def _write_chunked(path: str, data: bytes) -> None:
+    """Write bytes to path without the buffered/text I/O layers"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view[:WRITE_CHUNK_SIZE])
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(pattern, flags: int = 0) -> re.Pattern:
+    """re.compile, cached across tool calls (str and bytes patterns key separately)"""
+    return re.compile(pattern, flags)
+
+
+@functools.cache
+def _find_rg() -> Optional[str]:
+    """Locate ripgrep once per process"""
+    return shutil.which('rg')
+
+
+# A NUL byte within this many leading bytes marks a file as binary for grep
+BINARY_SNIFF_SIZE = 4096
+
+# Characters that make a grep pattern more than a literal string
+_REGEX_META = frozenset('.^$*+?{}[]\\|()')
+
+# Directories never descended into when walking for glob matches
+SKIP_DIRS = frozenset({'.git', 'node_modules', '__pycache__'})
+
+_GLOB_MAGIC = re.compile(r'[*?[]')
+
+
+@functools.lru_cache(maxsize=128)
+def _split_glob(full_pattern: str) -> Tuple[str, Tuple]:
+    """Split a glob into its literal root directory and compiled remaining parts
+
+    Each remaining part is either '**' or a compiled regex (from
+    fnmatch.translate) for one path component. As with glob, wildcards don't
+    match names starting with '.' unless the component itself starts with '.'.
+    Results are cached, so repeated searches reuse the compiled components.
+    """
+    components = full_pattern.split('/')
+    first_magic = next((i for i, c in enumerate(components) if _GLOB_MAGIC.search(c)),
+                       len(components))
+    root = '/'.join(components[:first_magic]) or ('/' if full_pattern.startswith('/') else '.')
+    parts = []
+    for component in components[first_magic:]:
+        if not component:
+            continue
+        if component == '**':
+            parts.append('**')
+        else:
+            regex = fnmatch.translate(component)
+            if not component.startswith('.'):
+                regex = r'(?!\.)' + regex
+            parts.append(re.compile(regex))
+    return root, tuple(parts)
+
+
+def _iter_glob(root: str, parts: Tuple, files_only: bool = False) -> Iterator[os.DirEntry]:
+    """Walk root with os.scandir, yielding entries whose relative path matches parts
+
+    Matching is done component by component while walking, so directories
+    that can't lead to a match are never opened. States are indices into
+    parts; '**' matches zero or more non-hidden directories. As with glob,
+    symlinked directories are followed and each directory's entries come
+    before those of its subdirectories, in directory order. A directory
+    that is already on the current path (a symlink loop) is not re-entered.
+    """
+    n = len(parts)
+
+    def closure(states: Set[int]) -> Set[int]:
+        result = set()
+        for i in states:
+            result.add(i)
+            while i < n and parts[i] == '**':
+                i += 1
+                result.add(i)
+        return result
+
+    try:
+        st = os.stat(root)
+    except OSError:
+        return
+
+    # Each stack entry carries the (st_dev, st_ino) of the directories on its path
+    stack = [(root, closure({0}), frozenset({(st.st_dev, st.st_ino)}))]
+    while stack:
+        dir_path, states, ancestors = stack.pop()
+        try:
+            entries = os.scandir(dir_path)
+        except OSError:
+            continue
+        subdirs = []
+        with entries:
+            for entry in entries:
+                name = entry.name
+                next_states = set()
+                for i in states:
+                    if i == n:
+                        continue
+                    part = parts[i]
+                    if part == '**':
+                        if not name.startswith('.'):
+                            next_states.add(i)
+                    elif part.match(name):
+                        next_states.add(i + 1)
+                if not next_states:
+                    continue
+                next_states = closure(next_states)
+
+                if n in next_states and (not files_only or entry.is_file()):
+                    yield entry
+                if (name not in SKIP_DIRS and any(i < n for i in next_states)
+                        and entry.is_dir()):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    key = (st.st_dev, st.st_ino)
+                    if key not in ancestors:
+                        subdirs.append((entry.path, next_states, ancestors | {key}))
+        # Reversed so the first subdirectory is walked next
+        stack.extend(reversed(subdirs))
+
+
 class ReadTool(Tool):
     """Read file contents"""
 
@@ -41,8 +240,12 @@ class ReadTool(Tool):
 
     async def execute(self, path: str, offset: int = 1, limit: Optional[int] = None, **kwargs) -> ToolResult:
         """Read file contents"""
+        return await _run_blocking(self._read_sync, path, offset, limit)
+
+    def _read_sync(self, path: str, offset: int, limit: Optional[int]) -> ToolResult:
+        """Blocking body of execute()"""
         try:
-            path = os.path.expanduser(path)
+            path = _expand(path)
 
             if not os.path.exists(path):
                 return ToolResult(
@@ -60,25 +263,23 @@ class ReadTool(Tool):
                     is_error=True
                 )
 
-            with open(path, 'r', encoding='utf-8', errors='replace') as f:
-                lines = f.readlines()
-
-            # Apply offset (1-based)
-            start_idx = max(0, offset - 1)
-            lines = lines[start_idx:]
-
-            # Apply limit
-            if limit:
-                lines = lines[:limit]
+            if os.path.getsize(path) > MMAP_THRESHOLD:
+                lines = self._read_window_mmap(path, offset, limit)
+            else:
+                # Skip to offset (1-based) and stop after limit without keeping other lines
+                start_idx = max(0, offset - 1)
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    lines = list(islice(f, start_idx, start_idx + limit if limit else None))
 
             # Format with line numbers
-            result_lines = []
+            out = io.StringIO()
+            write = out.write
             for i, line in enumerate(lines, start=offset):
-                result_lines.append(f"{i:6}\t{line.rstrip()}")
+                write('%6d\t%s\n' % (i, line.rstrip()))
 
             return ToolResult(
                 success=True,
-                content="\n".join(result_lines)
+                content=out.getvalue()[:-1]  # Drop the final newline
             )
 
         except Exception as e:
@@ -89,6 +290,35 @@ class ReadTool(Tool):
                 is_error=True
             )
 
+    @staticmethod
+    def _read_window_mmap(path: str, offset: int, limit: Optional[int]) -> List[str]:
+        """Return the requested lines of a large file, decoding only that window"""
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            for _ in range(max(0, offset - 1)):
+                newline = mm.find(b'\n', start)
+                if newline == -1:
+                    return []
+                start = newline + 1
+
+            end = len(mm)
+            if limit:
+                pos = start
+                for _ in range(limit):
+                    newline = mm.find(b'\n', pos)
+                    if newline == -1:
+                        pos = len(mm)
+                        break
+                    pos = newline + 1
+                end = pos
+
+            window = mm[start:end]
+
+        lines = window.decode('utf-8', errors='replace').split('\n')
+        if lines[-1] == '':
+            lines.pop()  # Text after the final newline (if any) is the last line
+        return lines
+
 
 class WriteTool(Tool):
     """Write content to a file"""
@@ -112,16 +342,22 @@ class WriteTool(Tool):
 
     async def execute(self, path: str, content: str, **kwargs) -> ToolResult:
         """Write content to file"""
+        return await _run_blocking(self._write_sync, path, content)
+
+    def _write_sync(self, path: str, content: str) -> ToolResult:
+        """Blocking body of execute()"""
         try:
-            path = os.path.expanduser(path)
+            path = _expand(path)
 
             # Create parent directories if needed
             parent = os.path.dirname(path)
             if parent and not os.path.exists(parent):
                 os.makedirs(parent, exist_ok=True)
 
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if len(content) > LARGE_WRITE_THRESHOLD:
+                _write_chunked(path, content.encode('utf-8'))
+            else:
+                Path(path).write_bytes(content.encode('utf-8'))
 
             return ToolResult(
                 success=True,
@@ -173,8 +409,13 @@ class EditTool(Tool):
     async def execute(self, path: str, old_string: str, new_string: str,
                       replace_all: bool = False, **kwargs) -> ToolResult:
         """Edit file by replacing text"""
+        return await _run_blocking(self._edit_sync, path, old_string, new_string, replace_all)
+
+    def _edit_sync(self, path: str, old_string: str, new_string: str,
+                   replace_all: bool) -> ToolResult:
+        """Blocking body of execute()"""
         try:
-            path = os.path.expanduser(path)
+            path = _expand(path)
 
             if not os.path.exists(path):
                 return ToolResult(
@@ -184,11 +425,32 @@ class EditTool(Tool):
                     is_error=True
                 )
 
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if not old_string:
+                return ToolResult(
+                    success=False,
+                    content="",
+                    error="old_string must not be empty",
+                    is_error=True
+                )
+
+            # For large files, count in the mapped bytes first so a missing or
+            # ambiguous match is rejected without decoding the file. Strings with
+            # line breaks are left to the text path (newline translation).
+            count = None
+            if ('\n' not in old_string and '\r' not in old_string
+                    and os.path.getsize(path) > MMAP_THRESHOLD):
+                count = _mmap_count(path, old_string.encode('utf-8'))
+
+            if count is None or count == 1 or (count > 1 and replace_all):
+                content = Path(path).read_bytes().decode('utf-8')
+                if '\r' in content:
+                    # Same newline translation text mode would have applied
+                    content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+                # One scan both counts occurrences and splits around them
+                parts = content.split(old_string)
+                count = len(parts) - 1
 
-            # Count occurrences
-            count = content.count(old_string)
             if count == 0:
                 return ToolResult(
                     success=False,
@@ -207,12 +469,11 @@ class EditTool(Tool):
 
             # Replace
             if replace_all:
-                new_content = content.replace(old_string, new_string)
+                new_content = new_string.join(parts)
             else:
-                new_content = content.replace(old_string, new_string, 1)
+                new_content = parts[0] + new_string + old_string.join(parts[1:])
 
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            Path(path).write_bytes(new_content.encode('utf-8'))
 
             return ToolResult(
                 success=True,
@@ -286,6 +547,20 @@ class BashTool(Tool):
         "shred",
     ]
 
+    # Characters of combined output returned; each stream is read up to the
+    # byte count that can hold this many UTF-8 characters, then the command
+    # is terminated instead of buffering the rest
+    OUTPUT_LIMIT = 30000
+    STREAM_CAP = OUTPUT_LIMIT * 4 + 4
+
+    # Normalized once at class load, matching how execute() normalizes commands
+    BLOCKED_COMMANDS_NORMALIZED = tuple(' '.join(b.split()) for b in BLOCKED_COMMANDS)
+
+    # execute() scans the command with a single alternation (list order is
+    # kept so earlier patterns win at the same position)
+    _BLOCKED_BY_NORMALIZED = dict(zip(BLOCKED_COMMANDS_NORMALIZED, BLOCKED_COMMANDS))
+    _BLOCKED_RE = re.compile('|'.join(map(re.escape, BLOCKED_COMMANDS_NORMALIZED)))
+
     # Patterns to warn about (not block)
     WARNING_PATTERNS = [
         "sudo ",
@@ -296,69 +571,50 @@ class BashTool(Tool):
         "eval ",
     ]
 
+    # Shell kept running between calls so simple commands skip fork/exec and
+    # shell startup; each command runs in a subshell so cd/exports don't leak
+    WORKER_SHELL = "/bin/sh"
+
+    # Commands that may leave processes running (background jobs, detached
+    # sessions). Those would keep writing into the shared worker's output
+    # after the call returns, so they get a fresh process instead. Matches a
+    # lone '&', not '&&', '|&' or redirections like '2>&1' and '&>file'.
+    _BACKGROUND_RE = re.compile(r'(?<![&>|<])&(?![&>])|\b(?:nohup|setsid|disown)\b')
+
+    def __init__(self):
+        self._worker: Optional[asyncio.subprocess.Process] = None
+        self._worker_lock = asyncio.Lock()
+
     async def execute(self, command: str, timeout: int = 120,
                       cwd: Optional[str] = None, **kwargs) -> ToolResult:
         """Execute bash command"""
         try:
             # Safety check - normalize whitespace for better pattern matching
             normalized_cmd = ' '.join(command.split())  # Collapse multiple spaces
-            for blocked in self.BLOCKED_COMMANDS:
-                normalized_blocked = ' '.join(blocked.split())
-                if normalized_blocked in normalized_cmd:
-                    return ToolResult(
-                        success=False,
-                        content="",
-                        error=f"Blocked dangerous command pattern: {blocked}",
-                        is_error=True
-                    )
-
-            # Expand paths
-            if cwd:
-                cwd = os.path.expanduser(cwd)
-
-            # Execute command
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=cwd or os.getcwd()
-            )
-
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=timeout
-                )
-            except asyncio.TimeoutError:
-                process.kill()
+            match = self._BLOCKED_RE.search(normalized_cmd)
+            if match:
+                blocked = self._BLOCKED_BY_NORMALIZED[match.group()]
                 return ToolResult(
                     success=False,
                     content="",
-                    error=f"Command timed out after {timeout} seconds",
+                    error=f"Blocked dangerous command pattern: {blocked}",
                     is_error=True
                 )
 
-            output = stdout.decode('utf-8', errors='replace')
-            error_output = stderr.decode('utf-8', errors='replace')
-
-            # Combine output
-            result = output
-            if error_output:
-                result += f"\n[stderr]\n{error_output}"
-
-            # Truncate if too long
-            if len(result) > 30000:
-                result = result[:30000] + "\n...[truncated]"
+            # Expand paths
+            if cwd:
+                cwd = _expand(cwd)
 
-            if process.returncode != 0:
-                return ToolResult(
-                    success=False,
-                    content=result,
-                    error=f"Command exited with code {process.returncode}",
-                    is_error=True
-                )
+            # Use the persistent shell unless a cwd is requested, the command
+            # may leave background processes, or another call is using it
+            if (not cwd and not self._worker_lock.locked()
+                    and not self._BACKGROUND_RE.search(command)):
+                async with self._worker_lock:
+                    result = await self._run_in_worker(command, timeout)
+                if result is not None:
+                    return result
 
-            return ToolResult(success=True, content=result)
+            return await self._run_fresh(command, timeout, cwd)
 
         except Exception as e:
             return ToolResult(
@@ -368,6 +624,201 @@ class BashTool(Tool):
                 is_error=True
             )
 
+    async def _run_fresh(self, command: str, timeout: int, cwd: Optional[str]) -> ToolResult:
+        """Run a command in a new shell process"""
+        process = await asyncio.create_subprocess_shell(
+            command,
+            stdin=asyncio.subprocess.DEVNULL,  # Same as the worker path; never the terminal
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,  # None inherits our working directory
+            start_new_session=True  # Own process group, so children can be stopped too
+        )
+
+        capped = False
+
+        def stop_at_cap():
+            nonlocal capped
+            if not capped:
+                capped = True
+                _signal_group(process, signal.SIGTERM)
+
+        async def read_capped(stream: asyncio.StreamReader) -> bytes:
+            buf = bytearray()
+            while True:
+                chunk = await stream.read(65536)
+                if not chunk:
+                    break
+                if len(buf) < self.STREAM_CAP:
+                    buf += chunk
+                    if len(buf) >= self.STREAM_CAP:
+                        del buf[self.STREAM_CAP:]
+                        stop_at_cap()
+                # Past the cap, keep draining (and discarding) until EOF so
+                # the pipe closes and process.wait() can complete
+            return bytes(buf)
+
+        async def drain():
+            out, err = await asyncio.gather(read_capped(process.stdout),
+                                            read_capped(process.stderr))
+            await process.wait()
+            return out, err
+
+        try:
+            stdout, stderr = await asyncio.wait_for(drain(), timeout=timeout)
+        except asyncio.TimeoutError:
+            _signal_group(process, signal.SIGKILL)
+            return self._timeout_result(timeout)
+
+        return self._format_result(stdout, stderr, process.returncode, capped)
+
+    async def _get_worker(self) -> Optional[asyncio.subprocess.Process]:
+        """Return the persistent shell, starting it if needed"""
+        if self._worker is None or self._worker.returncode is not None:
+            try:
+                self._worker = await asyncio.create_subprocess_exec(
+                    self.WORKER_SHELL,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    start_new_session=True
+                )
+            except OSError:
+                self._worker = None
+        return self._worker
+
+    def _kill_worker(self) -> None:
+        """Kill the persistent shell (and anything it started); it is respawned on next use"""
+        if self._worker is not None:
+            _signal_group(self._worker, signal.SIGKILL)
+            self._worker = None
+
+    async def _run_in_worker(self, command: str, timeout: int) -> Optional[ToolResult]:
+        """Run a command in the persistent shell
+
+        The command is passed quoted to eval inside a subshell (stdin from
+        /dev/null), then a marker with a random token is printed to stdout
+        (preceded by the exit status) and to stderr. Returns None if the
+        shell is unavailable so the caller can use a fresh process.
+        """
+        worker = await self._get_worker()
+        if worker is None:
+            return None
+
+        marker = f"__GLM_DONE_{secrets.token_hex(8)}__"
+        script = (
+            f"( eval {shlex.quote(command)} ) </dev/null\n"
+            f"printf '\\n%d:{marker}\\n' \"$?\"\n"
+            f"printf '\\n{marker}\\n' >&2\n"
+        )
+        try:
+            worker.stdin.write(script.encode('utf-8'))
+            await worker.stdin.drain()
+        except (ConnectionError, OSError):
+            self._kill_worker()
+            return None  # The shell died before running anything
+
+        end = (marker + "\n").encode('utf-8')
+        capped = False
+
+        def stop_at_cap():
+            nonlocal capped
+            if not capped:
+                capped = True
+                self._kill_worker()
+
+        async def read_until_marker(stream: asyncio.StreamReader) -> Tuple[bytes, bool]:
+            head = bytearray()
+            tail = b''  # Bytes that could be the start of a marker split across reads
+            truncated = False
+
+            def keep(body: bytes) -> None:
+                nonlocal truncated
+                room = self.STREAM_CAP - len(head)
+                if len(body) > room:
+                    truncated = True
+                    stop_at_cap()
+                if room > 0:
+                    head.extend(body[:room])
+
+            while True:
+                chunk = await stream.read(65536)
+                if not chunk:
+                    keep(tail)
+                    return bytes(head), False
+                window = tail + chunk
+                index = window.find(end)
+                if index != -1:
+                    keep(window[:index])
+                    # Only complete when the status before the marker was kept
+                    return bytes(head), not truncated
+                split = max(0, len(window) - len(end) + 1)
+                keep(window[:split])
+                tail = window[split:]
+
+        try:
+            (stdout, out_done), (stderr, err_done) = await asyncio.wait_for(
+                asyncio.gather(read_until_marker(worker.stdout), read_until_marker(worker.stderr)),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            self._kill_worker()
+            return self._timeout_result(timeout)
+
+        returncode = -1
+        if out_done:
+            # stdout ends with "\n<status>:" written before the marker
+            stdout, _, status = stdout[:-1].rpartition(b'\n')
+            returncode = int(status)
+        if err_done:
+            stderr = stderr[:-1]  # Newline written before the marker
+        if not (out_done and err_done) and not capped:
+            self._kill_worker()  # The shell exited mid-command
+
+        return self._format_result(stdout, stderr, returncode, capped)
+
+    def _format_result(self, stdout: bytes, stderr: bytes, returncode: int, capped: bool) -> ToolResult:
+        """Combine a command's output into a ToolResult"""
+        output = stdout.decode('utf-8', errors='replace')
+        error_output = stderr.decode('utf-8', errors='replace')
+
+        # Combine output
+        result = output
+        if error_output:
+            result += f"\n[stderr]\n{error_output}"
+
+        # Truncate if too long
+        if len(result) > self.OUTPUT_LIMIT:
+            result = result[:self.OUTPUT_LIMIT] + "\n...[truncated]"
+
+        if capped:
+            return ToolResult(
+                success=False,
+                content=result + "\n[process terminated: output limit exceeded]",
+                error=f"Command terminated after exceeding the output limit ({self.STREAM_CAP} bytes)",
+                is_error=True
+            )
+
+        if returncode != 0:
+            return ToolResult(
+                success=False,
+                content=result,
+                error=f"Command exited with code {returncode}",
+                is_error=True
+            )
+
+        return ToolResult(success=True, content=result)
+
+    @staticmethod
+    def _timeout_result(timeout: int) -> ToolResult:
+        """Result for a command that ran past its timeout"""
+        return ToolResult(
+            success=False,
+            content="",
+            error=f"Command timed out after {timeout} seconds",
+            is_error=True
+        )
+
 
 class GlobTool(Tool):
     """Find files matching glob pattern"""
@@ -392,22 +843,25 @@ class GlobTool(Tool):
     async def execute(self, pattern: str, path: Optional[str] = None, **kwargs) -> ToolResult:
         """Find files matching glob pattern"""
         try:
-            base_path = os.path.expanduser(path) if path else os.getcwd()
+            base_path = _expand(path) if path else _cwd()
 
             # Make pattern relative to base path
             full_pattern = os.path.join(base_path, pattern)
+            root, parts = _split_glob(full_pattern)
 
-            # Find matching files
-            matches = glob_module.glob(full_pattern, recursive=True)
-
-            # Sort by modification time (newest first)
-            # Use try-except to handle files deleted between glob and sort
-            def safe_getmtime(path):
-                try:
-                    return os.path.getmtime(path)
-                except (OSError, FileNotFoundError):
-                    return 0
-            matches.sort(key=safe_getmtime, reverse=True)
+            if not parts:
+                # No wildcards: the pattern names a single path
+                matches = [full_pattern] if os.path.lexists(full_pattern) else []
+            else:
+                # Sort by modification time (newest first), using the stat cached on
+                # each DirEntry; files deleted since the walk sort last
+                def safe_getmtime(entry):
+                    try:
+                        return entry.stat().st_mtime
+                    except OSError:
+                        return 0
+                entries = sorted(_iter_glob(root, parts), key=safe_getmtime, reverse=True)
+                matches = [entry.path for entry in entries]
 
             if not matches:
                 return ToolResult(
@@ -472,39 +926,27 @@ class GrepTool(Tool):
                       **kwargs) -> ToolResult:
         """Search for pattern in files"""
         try:
-            base_path = os.path.expanduser(path) if path else os.getcwd()
+            base_path = _expand(path) if path else _cwd()
 
             # Compile regex
             flags = re.IGNORECASE if case_insensitive else 0
-            regex = re.compile(pattern, flags)
-
-            results = []
-
-            # Get files to search
-            if os.path.isfile(base_path):
-                files = [base_path]
-            else:
-                if glob:
-                    file_pattern = os.path.join(base_path, "**", glob)
-                else:
-                    file_pattern = os.path.join(base_path, "**", "*")
-                files = glob_module.glob(file_pattern, recursive=True)
-                files = [f for f in files if os.path.isfile(f)]
-
-            # Search in files
-            for file_path in files[:100]:  # Limit files
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                        for line_num, line in enumerate(f, 1):
-                            if regex.search(line):
-                                results.append(f"{file_path}:{line_num}: {line.rstrip()}")
-                                if len(results) >= 500:  # Limit results
-                                    break
-                except Exception:
-                    continue
-
-                if len(results) >= 500:
-                    break
+            regex = _compile(pattern, flags)
+
+            # Plain ASCII strings are scanned as raw bytes with one regex pass.
+            # Anything else (classes like \w or ., anchors, case folding) differs
+            # between bytes and str patterns, so it is searched line by line
+            bytes_regex = None
+            if (pattern.isascii() and not case_insensitive
+                    and '\n' not in pattern and _REGEX_META.isdisjoint(pattern)):
+                bytes_regex = _compile(pattern.encode('ascii'), 0)
+
+            # Prefer ripgrep when installed; fall back to scanning in Python
+            results = None
+            rg = _find_rg()
+            if rg:
+                results = await self._search_rg(rg, pattern, base_path, glob, case_insensitive)
+            if results is None:
+                results = await self._search_files(regex, bytes_regex, base_path, glob)
 
             if not results:
                 return ToolResult(
@@ -533,6 +975,162 @@ class GrepTool(Tool):
                 is_error=True
             )
 
+    async def _search_files(self, regex: "re.Pattern[str]", bytes_regex: Optional["re.Pattern[bytes]"],
+                            base_path: str, glob: Optional[str]) -> List[str]:
+        """Search files under base_path in Python, scanning several files at once
+
+        Files are scanned on the I/O pool; results are kept in file order. Once
+        500 matches are in, files not yet started are skipped.
+        """
+        files = await _run_blocking(self._list_files, base_path, glob)
+
+        found = 0  # Only updated on the event loop, so no lock is needed
+        semaphore = asyncio.Semaphore((os.cpu_count() or 1) * 2)
+
+        async def scan(file_path: str) -> List[str]:
+            nonlocal found
+            async with semaphore:
+                if found >= 500:
+                    return []
+                lines = await _run_blocking(self._scan_file, file_path, regex, bytes_regex)
+                found += len(lines)
+                return lines
+
+        results = []
+        for lines in await asyncio.gather(*(scan(f) for f in files)):
+            results.extend(lines)
+            if len(results) >= 500:  # Limit results
+                del results[500:]
+                break
+        return results
+
+    @staticmethod
+    def _list_files(base_path: str, glob: Optional[str]) -> List[str]:
+        """Get the files to search (at most 100)"""
+        if os.path.isfile(base_path):
+            return [base_path]
+        if glob:
+            file_pattern = os.path.join(base_path, "**", glob)
+        else:
+            file_pattern = os.path.join(base_path, "**", "*")
+        root, parts = _split_glob(file_pattern)
+        # The walk stops as soon as the file limit is reached
+        return [entry.path for entry in islice(_iter_glob(root, parts, files_only=True), 100)]
+
+    def _scan_file(self, file_path: str, regex: "re.Pattern[str]",
+                   bytes_regex: Optional["re.Pattern[bytes]"]) -> List[str]:
+        """Return up to 500 matching lines of one file"""
+        results = []
+        try:
+            searched = False
+            if bytes_regex is not None:
+                if os.path.getsize(file_path) > MMAP_THRESHOLD:
+                    with open(file_path, 'rb') as f, \
+                            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        searched = self._search_bytes(file_path, mm, bytes_regex, results)
+                else:
+                    with open(file_path, 'rb') as f:
+                        data = f.read()
+                    searched = self._search_bytes(file_path, data, bytes_regex, results)
+            if not searched:
+                with open(file_path, 'rb') as f:
+                    if b'\x00' in f.read(BINARY_SNIFF_SIZE):
+                        return []  # Binary file
+                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                    for line_num, line in enumerate(f, 1):
+                        if regex.search(line):
+                            results.append(f"{file_path}:{line_num}: {line.rstrip()}")
+                            if len(results) >= 500:  # Limit results
+                                break
+        except Exception:
+            return []
+        return results
+
+    async def _search_rg(self, rg: str, pattern: str, base_path: str, glob: Optional[str],
+                         case_insensitive: bool) -> Optional[List[str]]:
+        """Search with ripgrep, returning None if rg failed so the caller can fall back
+
+        Note that rg skips hidden, ignored and binary files, and uses Rust regex
+        syntax (patterns it rejects, e.g. lookarounds, fall back to Python).
+        """
+        # --sort path keeps the order (and which matches survive the cap) stable
+        args = [rg, '--json', '--sort', 'path']
+        if case_insensitive:
+            args.append('-i')
+        if glob:
+            args += ['-g', glob]
+        args += ['-e', pattern, '--', base_path]
+
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=16 * 1024 * 1024  # Allow very long matched lines
+        )
+
+        results = []
+        drained = False  # rg closed its output, so it exits without help
+        try:
+            async for raw in process.stdout:
+                if b'"type":"match"' not in raw:
+                    continue  # begin/end/summary records
+                data = json.loads(raw)["data"]
+                file_path = data["path"].get("text")
+                line = data["lines"].get("text")
+                if file_path is None or line is None:
+                    continue  # Non-UTF-8 path or line (sent base64-encoded)
+                results.append(f"{file_path}:{data['line_number']}: {line.rstrip()}")
+                if len(results) >= 500:  # Limit results
+                    break
+            else:
+                drained = True
+        finally:
+            # On the result limit or any error rg may be blocked on a full
+            # pipe, so stop it rather than wait on it
+            if process.returncode is None and not drained:
+                process.kill()
+            await process.wait()
+
+        # Exit code 2 means an error (e.g. unsupported regex); 1 just means no matches
+        if process.returncode == 2 and not results:
+            return None
+        return results
+
+    @staticmethod
+    def _search_bytes(file_path: str, buf, regex: "re.Pattern[bytes]", results: List[str]) -> bool:
+        """Append matching lines of a file's bytes (or mmap) using one regex scan
+
+        The pattern must be a literal ASCII string, which matches the same
+        text as bytes as it does as str and cannot span lines.
+        Line numbers are found by counting newlines between matches, so the
+        Python-level work is per match rather than per line. Returns False
+        without searching if the file has carriage returns, which the
+        text-mode path treats as line breaks. Binary files (a NUL byte near
+        the start) are skipped, as grep and rg do by default.
+        """
+        if buf.find(b'\x00', 0, BINARY_SNIFF_SIZE) != -1:
+            return True
+        if buf.find(b'\r') != -1:
+            return False
+        size = len(buf)
+        line_num = 1
+        counted = 0  # Offset up to which newlines have been counted into line_num
+        pos = 0
+        while pos < size and len(results) < 500:
+            match = regex.search(buf, pos)
+            if match is None or (match.start() == size and buf[-1:] == b'\n'):
+                break  # An empty match after the final newline is not a line
+            start = buf.rfind(b'\n', 0, match.start()) + 1
+            end = buf.find(b'\n', match.start())
+            if end == -1:
+                end = size
+            line_num += buf[counted:start].count(b'\n')
+            counted = start
+            line = buf[start:end].decode('utf-8', errors='replace').rstrip()
+            results.append(f"{file_path}:{line_num}: {line}")
+            pos = end + 1  # One result per line, like the line-by-line path
+        return True
+
 
 # Register all local tools
 def register_local_tools(registry):
@@ -13,6 +13,25 @@ from dataclasses import dataclass
 
 from .base import ToolResult
 
+try:
+    import orjson
+except ImportError:  # Optional dependency - fall back to stdlib json
+    orjson = None
+
+
+def _dumps_line(message: Dict[str, Any]) -> bytes:
+    """Encode a JSON-RPC message as one newline-terminated line"""
+    if orjson is not None:
+        return orjson.dumps(message) + b"\n"
+    return (json.dumps(message) + "\n").encode('utf-8')
+
+
+def _loads(line: bytes) -> Any:
+    """Decode one JSON-RPC message line"""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line.decode('utf-8'))
+
 
 @dataclass
 class MCPServer:
@@ -36,6 +55,10 @@ class MCPClient:
         self.connections: Dict[str, Tuple[asyncio.StreamReader, asyncio.StreamWriter, asyncio.subprocess.Process]] = {}
         self.tools: Dict[str, Dict[str, Any]] = {}
         self._request_id = 0
+        # Responses are read by one task per server and matched to waiting
+        # requests by id, so several requests can be in flight at once
+        self._pending: Dict[str, Dict[int, asyncio.Future]] = {}
+        self._readers: Dict[str, asyncio.Task] = {}
 
     def load_config(self, config_path: str = "~/.mcp.json") -> None:
         """Load MCP server configuration"""
@@ -100,6 +123,10 @@ class MCPClient:
                     process.stdin,
                     process
                 )
+                self._pending[server_name] = {}
+                self._readers[server_name] = asyncio.create_task(
+                    self._reader_loop(server_name, process.stdout)
+                )
 
                 # Initialize the connection
                 await self._initialize(server_name)
@@ -111,6 +138,7 @@ class MCPClient:
 
             except Exception as e:
                 # Clean up failed connection
+                self._stop_reader(server_name)
                 if server_name in self.connections:
                     del self.connections[server_name]
 
@@ -128,6 +156,7 @@ class MCPClient:
             return
 
         _, writer, process = self.connections[server_name]
+        self._stop_reader(server_name)
 
         try:
             writer.close()
@@ -156,28 +185,75 @@ class MCPClient:
         self._request_id += 1
         return self._request_id
 
+    async def _reader_loop(self, server_name: str, reader: asyncio.StreamReader) -> None:
+        """Read responses from a server and resolve the matching pending requests"""
+        error: Exception = RuntimeError(f"MCP server {server_name} closed the connection")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = _loads(line)
+                except ValueError:
+                    continue  # Not JSON-RPC (e.g. a log line)
+                if not isinstance(response, dict):
+                    continue
+                future = self._pending.get(server_name, {}).get(response.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+        finally:
+            for future in self._pending.get(server_name, {}).values():
+                if not future.done():
+                    future.set_exception(error)
+
+    def _stop_reader(self, server_name: str) -> None:
+        """Cancel a server's reader task and drop its pending requests"""
+        task = self._readers.pop(server_name, None)
+        if task is not None:
+            task.cancel()
+        for future in self._pending.pop(server_name, {}).values():
+            if not future.done():
+                future.cancel()
+
     async def _send_request(self, server_name: str, method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Send JSON-RPC request to MCP server"""
         if server_name not in self.connections:
             raise RuntimeError(f"Not connected to server: {server_name}")
 
-        reader, writer, _ = self.connections[server_name]
+        # Nothing resolves requests once the reader has exited (server closed
+        # its output or died), so fail now instead of waiting for the timeout
+        reader_task = self._readers.get(server_name)
+        if reader_task is None or reader_task.done():
+            raise RuntimeError(f"MCP server {server_name} closed the connection")
 
+        _, writer, _ = self.connections[server_name]
+        pending = self._pending[server_name]
+
+        request_id = self._get_request_id()
         request = {
             "jsonrpc": "2.0",
-            "id": self._get_request_id(),
+            "id": request_id,
             "method": method,
             "params": params or {}
         }
 
-        # Send request
-        request_str = json.dumps(request) + "\n"
-        writer.write(request_str.encode('utf-8'))
-        await writer.drain()
+        # Register before writing so a fast response can't be missed
+        future = asyncio.get_running_loop().create_future()
+        pending[request_id] = future
+        try:
+            # Send request
+            writer.write(_dumps_line(request))
+            await writer.drain()
 
-        # Read response
-        response_line = await asyncio.wait_for(reader.readline(), timeout=30)
-        response = json.loads(response_line.decode('utf-8'))
+            # Wait for the reader task to deliver the response
+            response = await asyncio.wait_for(future, timeout=self.REQUEST_TIMEOUT)
+        finally:
+            pending.pop(request_id, None)
 
         if "error" in response:
             raise RuntimeError(f"MCP error: {response['error']}")
@@ -207,7 +283,7 @@ class MCPClient:
                 "jsonrpc": "2.0",
                 "method": "notifications/initialized"
             }
-            writer.write((json.dumps(notification) + "\n").encode('utf-8'))
+            writer.write(_dumps_line(notification))
             await writer.drain()
 
     async def _list_tools(self, server_name: str) -> List[Dict[str, Any]]:
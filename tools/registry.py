@@ -13,10 +13,19 @@ class ToolRegistry:
     def __init__(self):
         self._tools: Dict[str, Tool] = {}
         self._mcp_tools: Dict[str, Dict[str, Any]] = {}
+        # Derived listings, rebuilt on next use after any registration
+        self._schema_cache: Optional[List[Dict[str, Any]]] = None
+        self._names_cache: Optional[List[str]] = None
+
+    def _invalidate(self) -> None:
+        """Drop cached listings"""
+        self._schema_cache = None
+        self._names_cache = None
 
     def register(self, tool: Tool) -> None:
         """Register a local tool"""
         self._tools[tool.name] = tool
+        self._invalidate()
 
     def register_mcp_tool(self, server_name: str, tool_name: str, schema: Dict[str, Any]) -> None:
         """Register an MCP tool"""
@@ -26,6 +35,7 @@ class ToolRegistry:
             "name": tool_name,
             "schema": schema
         }
+        self._invalidate()
 
     def get_tool(self, name: str) -> Optional[Tool]:
         """Get a tool by name"""
@@ -36,11 +46,22 @@ class ToolRegistry:
         return self._mcp_tools.get(name)
 
     def list_tools(self) -> List[str]:
-        """List all registered tools"""
-        return list(self._tools.keys()) + list(self._mcp_tools.keys())
+        """List all registered tools
+
+        The list is cached and shared between calls; callers must not mutate it.
+        """
+        if self._names_cache is None:
+            self._names_cache = list(self._tools.keys()) + list(self._mcp_tools.keys())
+        return self._names_cache
 
     def get_all_schemas(self) -> List[Dict[str, Any]]:
-        """Get schemas for all tools (for API)"""
+        """Get schemas for all tools (for API)
+
+        The list is cached and shared between calls; callers must not mutate it.
+        """
+        if self._schema_cache is not None:
+            return self._schema_cache
+
         schemas = []
 
         # Local tools
@@ -51,6 +72,7 @@ class ToolRegistry:
         for mcp_tool in self._mcp_tools.values():
             schemas.append(mcp_tool["schema"])
 
+        self._schema_cache = schemas
         return schemas
 
     async def execute(self, tool_name: str, **kwargs) -> ToolResult:
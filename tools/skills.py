@@ -5,34 +5,126 @@ Skills are predefined workflows/prompts for common tasks.
 Supports loading custom skills from ~/.glm/skills/
 """
 
+import functools
+import json
+import mmap
 import os
 import re
 import yaml
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Callable, Any
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Callable, Any, Tuple
 
+try:
+    import orjson
+except ImportError:  # Optional dependency - fall back to stdlib json
+    orjson = None
 
-@dataclass
+# Parsed skill metadata, kept in the skills directory and reused while the files are unchanged
+SKILL_INDEX_FILE = ".index.json"
+_INDEX_ENTRY_KEYS = ("file", "name", "description", "keywords", "requires_args")
+
+# YAML frontmatter followed by the markdown body; matched as bytes against
+# a memory-mapped file so the frontmatter can be read without the body
+_FRONTMATTER_RE = re.compile(rb'\A---\n(.*?)\n---\n', re.DOTALL)
+_BODY_RE = re.compile(rb'\A---\n.*?\n---\n(.*)\Z', re.DOTALL)
+
+# Prefer the libyaml C loader; fall back to the pure-Python loader
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@dataclass(slots=True, frozen=True)
 class Skill:
-    """Skill definition"""
+    """Skill definition
+
+    External skills leave prompt_template unset and provide template_loader,
+    so the body is only read when the skill is run.
+    """
     name: str
     description: str
-    prompt_template: str
-    keywords: List[str]
+    keywords: Tuple[str, ...]
     requires_args: bool = False
+    prompt_template: Optional[str] = None
+    template_loader: Optional[Callable[[], str]] = field(default=None, repr=False, compare=False)
+
+    def get_template(self) -> Optional[str]:
+        """Get prompt template, loading it if needed (None if it can't be read)"""
+        if self.prompt_template is not None:
+            return self.prompt_template
+        if self.template_loader is not None:
+            return self.template_loader()
+        return ""
+
+
+def _match_skill_file(file_path: Path, pattern: re.Pattern) -> Optional[str]:
+    """Match a skill file against a bytes pattern and decode the captured span
+
+    Only the captured span is copied out of the mapping. Files with CR
+    line endings are matched on a normalized copy, as text mode would.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            match = pattern.match(mm)
+            if match is None and mm.find(b'\r') != -1:
+                match = pattern.match(mm[:].replace(b'\r\n', b'\n').replace(b'\r', b'\n'))
+            return match.group(1).decode('utf-8') if match else None
+
+
+def _load_skill_body(file_path: Path) -> Optional[str]:
+    """Read the prompt template (markdown body) of a skill file
+
+    Returns None if the file can no longer be read.
+    """
+    try:
+        st = file_path.stat()
+        return _read_skill_body(file_path, st.st_mtime_ns, st.st_size)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def _read_skill_body(file_path: Path, mtime_ns: int, size: int) -> str:
+    """Read a skill body; keyed on mtime and size so edited files are re-read"""
+    body = _match_skill_file(file_path, _BODY_RE)
+    return body.strip() if body is not None else ""
+
+
+def _index_keywords(skills) -> Dict[str, Skill]:
+    """Map each lowercased keyword to the first skill using it"""
+    index: Dict[str, Skill] = {}
+    for skill in skills:
+        for keyword in skill.keywords:
+            index.setdefault(keyword.lower(), skill)
+    return index
 
 
 class SkillRegistry:
-    """Registry for managing skills"""
+    """Registry for managing skills
+
+    Starts out with the built-in skills, copied from the indexes built at import.
+    """
 
     def __init__(self):
-        self.skills: Dict[str, Skill] = {}
+        self.skills: Dict[str, Skill] = dict(_BUILTIN_INDEX)
         self._loaded = False
+        # Lowercased keyword -> first registered skill using it
+        self._keyword_index: Dict[str, Skill] = dict(_BUILTIN_KW_INDEX)
 
     def register(self, skill: Skill) -> None:
         """Register a skill"""
+        replaced = skill.name in self.skills
         self.skills[skill.name] = skill
+        if replaced:
+            self._rebuild_keyword_index()
+        else:
+            for keyword in skill.keywords:
+                self._keyword_index.setdefault(keyword.lower(), skill)
+
+    def _rebuild_keyword_index(self) -> None:
+        """Rebuild the keyword index from all registered skills"""
+        self._keyword_index = _index_keywords(self.skills.values())
 
     def get_skill(self, name: str) -> Optional[Skill]:
         """Get skill by name"""
@@ -49,10 +141,11 @@ class SkillRegistry:
         """Find skill matching keywords in text"""
         text_lower = text.lower()
 
-        for skill in self.skills.values():
-            for keyword in skill.keywords:
-                if keyword.lower() in text_lower:
-                    return skill
+        # Index order follows registration order, so the first hit is the
+        # same skill a scan of every skill's keywords would find
+        for keyword, skill in self._keyword_index.items():
+            if keyword in text_lower:
+                return skill
 
         return None
 
@@ -60,9 +153,12 @@ class SkillRegistry:
         """Get expanded prompt for skill"""
         skill = self.get_skill(name)
         if skill:
-            if "{args}" in skill.prompt_template:
-                return skill.prompt_template.format(args=args)
-            return skill.prompt_template
+            template = skill.get_template()
+            if template is None:
+                return None
+            if "{args}" in template:
+                return template.format(args=args)
+            return template
         return None
 
     def load_external_skills(self, skills_dir: Optional[str] = None) -> int:
@@ -82,18 +178,98 @@ class SkillRegistry:
         if not skills_dir.exists():
             return 0
 
+        signature = self._signature(skills_dir)
+        entries = self._load_index(skills_dir, signature)
+        if entries is None:
+            entries = []
+            failed = False
+            for file_name, _, _ in signature:
+                skill_file = skills_dir / file_name
+                try:
+                    skill = self._parse_skill_file(skill_file)
+                except Exception as e:
+                    failed = True
+                    print(f"Error loading skill {skill_file}: {e}")
+                    continue
+                if skill:
+                    entries.append({
+                        "file": file_name,
+                        "name": skill.name,
+                        "description": skill.description,
+                        "keywords": skill.keywords,
+                        "requires_args": skill.requires_args,
+                    })
+
+            # Only index clean parses so broken files are reported again next run
+            if not failed:
+                self._save_index(skills_dir, signature, entries)
+
         loaded = 0
-        for skill_file in skills_dir.glob("*.md"):
-            try:
-                skill = self._parse_skill_file(skill_file)
-                if skill and skill.name not in self.skills:
-                    self.register(skill)
-                    loaded += 1
-            except Exception as e:
-                print(f"Error loading skill {skill_file}: {e}")
+        for entry in entries:
+            if entry["name"] in self.skills:
+                continue
+            self.register(Skill(
+                name=entry["name"],
+                description=entry["description"],
+                keywords=tuple(entry["keywords"]),
+                requires_args=entry["requires_args"],
+                template_loader=functools.partial(_load_skill_body, skills_dir / entry["file"])
+            ))
+            loaded += 1
 
         return loaded
 
+    @staticmethod
+    def _signature(skills_dir: Path) -> List[List[Any]]:
+        """Identify the current skill files by name, mtime and size"""
+        signature = []
+        with os.scandir(skills_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".md"):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                signature.append([entry.name, st.st_mtime_ns, st.st_size])
+        return signature
+
+    @staticmethod
+    def _load_index(skills_dir: Path, signature: List[List[Any]]) -> Optional[List[Dict[str, Any]]]:
+        """Return indexed skill entries if the index matches the signature"""
+        try:
+            data = (skills_dir / SKILL_INDEX_FILE).read_bytes()
+            index = orjson.loads(data) if orjson is not None else json.loads(data)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(index, dict) or index.get("signature") != signature:
+            return None
+        entries = index.get("skills")
+        # A damaged entry discards the whole index so every file is re-parsed
+        if not isinstance(entries, list):
+            return None
+        for entry in entries:
+            if (not isinstance(entry, dict)
+                    or not all(key in entry for key in _INDEX_ENTRY_KEYS)
+                    or not isinstance(entry["file"], str)
+                    or not isinstance(entry["keywords"], list)):
+                return None
+        return entries
+
+    @staticmethod
+    def _save_index(skills_dir: Path, signature: List[List[Any]], entries: List[Dict[str, Any]]) -> None:
+        """Atomically write the skill index"""
+        index = {"signature": signature, "skills": entries}
+        try:
+            data = orjson.dumps(index) if orjson is not None else json.dumps(index).encode('utf-8')
+            tmp_file = skills_dir / f"{SKILL_INDEX_FILE}.{os.getpid()}.tmp"
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, skills_dir / SKILL_INDEX_FILE)
+        except (OSError, TypeError):
+            pass  # Index is best-effort
+
     def _parse_skill_file(self, file_path: Path) -> Optional[Skill]:
         """Parse skill definition from markdown file
 
@@ -105,21 +281,19 @@ class SkillRegistry:
         requires_args: false
         ---
         Prompt template content here...
-        """
-        content = file_path.read_text(encoding='utf-8')
 
+        Only the frontmatter is read here; the body is loaded on first use.
+        """
         # Parse YAML frontmatter
-        frontmatter_match = re.match(r'^---\n(.*?)\n---\n(.*)$', content, re.DOTALL)
-        if not frontmatter_match:
+        frontmatter_text = _match_skill_file(file_path, _FRONTMATTER_RE)
+        if frontmatter_text is None:
             return None
 
         try:
-            frontmatter = yaml.safe_load(frontmatter_match.group(1))
+            frontmatter = yaml.load(frontmatter_text, Loader=_YamlLoader)
         except yaml.YAMLError:
             return None
 
-        body = frontmatter_match.group(2).strip()
-
         name = frontmatter.get('name', file_path.stem)
         description = frontmatter.get('description', '')
         keywords = frontmatter.get('keywords', [])
@@ -131,22 +305,18 @@ class SkillRegistry:
         return Skill(
             name=name,
             description=description,
-            prompt_template=body,
-            keywords=keywords,
-            requires_args=requires_args
+            keywords=tuple(keywords),
+            requires_args=requires_args,
+            template_loader=functools.partial(_load_skill_body, file_path)
         )
 
 
-# Global registry
-skill_registry = SkillRegistry()
-
-
 # Built-in skills (10 core skills)
 BUILTIN_SKILLS = [
     Skill(
         name="commit",
         description="Create a well-formatted git commit",
-        keywords=["commit", "커밋"],
+        keywords=("commit", "커밋"),
         requires_args=False,
         prompt_template="""Create a git commit for the current changes.
 
@@ -165,7 +335,7 @@ Execute the commit after confirming the message."""
     Skill(
         name="review",
         description="Review code changes for quality and issues",
-        keywords=["review", "리뷰", "검토"],
+        keywords=("review", "리뷰", "검토"),
         requires_args=False,
         prompt_template="""Review the recent code changes.
 
@@ -185,7 +355,7 @@ Steps:
     Skill(
         name="test",
         description="Run tests and fix failures",
-        keywords=["test", "테스트"],
+        keywords=("test", "테스트"),
         requires_args=False,
         prompt_template="""Run the test suite and handle results.
 
@@ -201,7 +371,7 @@ Steps:
     Skill(
         name="docs",
         description="Generate or update documentation",
-        keywords=["docs", "문서", "readme"],
+        keywords=("docs", "문서", "readme"),
         requires_args=True,
         prompt_template="""Generate or update documentation.
 
@@ -221,7 +391,7 @@ Ensure:
     Skill(
         name="refactor",
         description="Refactor code to improve structure",
-        keywords=["refactor", "리팩토링"],
+        keywords=("refactor", "리팩토링"),
         requires_args=True,
         prompt_template="""Refactor the specified code.
 
@@ -239,7 +409,7 @@ Ensure tests still pass after refactoring."""
     Skill(
         name="audit",
         description="Perform security audit on codebase",
-        keywords=["audit", "감사", "security", "보안"],
+        keywords=("audit", "감사", "security", "보안"),
         requires_args=False,
         prompt_template="""Perform a security audit on the codebase.
 
@@ -268,7 +438,7 @@ Report findings with severity and remediation steps."""
     Skill(
         name="optimize",
         description="Optimize code performance",
-        keywords=["optimize", "최적화", "performance", "성능"],
+        keywords=("optimize", "최적화", "performance", "성능"),
         requires_args=True,
         prompt_template="""Optimize the specified code or component.
 
@@ -286,7 +456,7 @@ Profile before and after to measure improvement."""
     Skill(
         name="git-push",
         description="Push changes to remote repository",
-        keywords=["push", "푸시"],
+        keywords=("push", "푸시"),
         requires_args=False,
         prompt_template="""Push local commits to the remote repository.
 
@@ -300,7 +470,7 @@ Steps:
     Skill(
         name="explore",
         description="Explore and understand codebase structure",
-        keywords=["explore", "탐색", "structure", "구조"],
+        keywords=("explore", "탐색", "structure", "구조"),
         requires_args=True,
         prompt_template="""Explore and explain the codebase.
 
@@ -318,7 +488,7 @@ Provide a clear overview of how the code is organized."""
     Skill(
         name="fix",
         description="Fix a bug or issue",
-        keywords=["fix", "수정", "bug", "버그"],
+        keywords=("fix", "수정", "bug", "버그"),
         requires_args=True,
         prompt_template="""Fix the reported issue.
 
@@ -335,11 +505,10 @@ Process:
 ]
 
 
-def register_builtin_skills():
-    """Register built-in skills"""
-    for skill in BUILTIN_SKILLS:
-        skill_registry.register(skill)
+# Built-in skill indexes, built once at import
+_BUILTIN_INDEX = {skill.name: skill for skill in BUILTIN_SKILLS}
+_BUILTIN_KW_INDEX = _index_keywords(BUILTIN_SKILLS)
 
 
-# Auto-register built-in skills
-register_builtin_skills()
+# Global registry
+skill_registry = SkillRegistry()
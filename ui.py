@@ -1,9 +1,18 @@
 """UI components for GLM CLI - Claude Code style"""
 
+import functools
 import os
 import sys
+import time
 from typing import Optional
 
+if os.name != 'nt':
+    import select
+    import termios
+    import tty
+else:  # POSIX-only modules; the interactive selector is unavailable on Windows
+    select = termios = tty = None
+
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
@@ -49,7 +58,12 @@ class Colors:
 
 def get_banner() -> str:
     """Generate the startup banner"""
-    cwd = os.getcwd()
+    return _render_banner(os.getcwd(), config.model)
+
+
+@functools.lru_cache(maxsize=4)
+def _render_banner(cwd: str, model: str) -> str:
+    """Format the banner for a working directory and model"""
     # Truncate cwd if too long
     max_len = 30
     if len(cwd) > max_len:
@@ -57,7 +71,7 @@ def get_banner() -> str:
 
     return GLM_LOGO.format(
         version=__version__,
-        model=config.model.upper(),
+        model=model.upper(),
         cwd=cwd
     )
 
@@ -76,24 +90,35 @@ def print_welcome():
     console.print()
 
 
+# Markup around print_* messages, built once since Colors never change
+_ERROR_PREFIX = f"[{Colors.ERROR}]✗ "
+_ERROR_SUFFIX = f"[/{Colors.ERROR}]"
+_WARNING_PREFIX = f"[{Colors.WARNING}]⚠ "
+_WARNING_SUFFIX = f"[/{Colors.WARNING}]"
+_INFO_PREFIX = f"[{Colors.INFO}]ℹ "
+_INFO_SUFFIX = f"[/{Colors.INFO}]"
+_SUCCESS_PREFIX = f"[{Colors.PRIMARY}]✓ "
+_SUCCESS_SUFFIX = f"[/{Colors.PRIMARY}]"
+
+
 def print_error(message: str):
     """Print error message"""
-    console.print(f"[{Colors.ERROR}]✗ {message}[/{Colors.ERROR}]")
+    console.print(_ERROR_PREFIX + message + _ERROR_SUFFIX)
 
 
 def print_warning(message: str):
     """Print warning message"""
-    console.print(f"[{Colors.WARNING}]⚠ {message}[/{Colors.WARNING}]")
+    console.print(_WARNING_PREFIX + message + _WARNING_SUFFIX)
 
 
 def print_info(message: str):
     """Print info message"""
-    console.print(f"[{Colors.INFO}]ℹ {message}[/{Colors.INFO}]")
+    console.print(_INFO_PREFIX + message + _INFO_SUFFIX)
 
 
 def print_success(message: str):
     """Print success message"""
-    console.print(f"[{Colors.PRIMARY}]✓ {message}[/{Colors.PRIMARY}]")
+    console.print(_SUCCESS_PREFIX + message + _SUCCESS_SUFFIX)
 
 
 def print_model_update(current: str, latest: str):
@@ -110,9 +135,7 @@ def print_model_update(current: str, latest: str):
     console.print()
 
 
-def print_help():
-    """Print help message"""
-    help_text = """
+_HELP_TEXT = """
 [bold]Basic Commands:[/bold]
 
   [cyan]/help[/cyan]              Show this help message
@@ -130,6 +153,7 @@ def print_help():
   [cyan]/compact[/cyan]           Compress conversation context
   [cyan]/rewind[/cyan]            Go back to a previous message
   [cyan]/session[/cyan]           Show/list sessions
+  [cyan]/session export[/cyan]    Export session as JSON
   [cyan]/config[/cyan]            Show current configuration
 
 [bold]Tools & MCP:[/bold]
@@ -161,19 +185,37 @@ def print_help():
   [cyan]Ctrl+L[/cyan]             Clear screen
   [cyan]↑/↓[/cyan]                Navigate history
 """
-    console.print(Panel(help_text, title="[bold]GLM CLI Help[/bold]", border_style=Colors.ACCENT))
+
+# The help content never changes, so the panel is built once and reprinted
+_HELP_PANEL = Panel(_HELP_TEXT, title="[bold]GLM CLI Help[/bold]", border_style=Colors.ACCENT)
+
+
+def print_help():
+    """Print help message"""
+    console.print(_HELP_PANEL)
 
 
 class StreamingDisplay:
     """Display streaming response with live updates"""
 
+    # Re-parse the markdown only after this much new text or this much time,
+    # since each render parses the whole response again
+    RENDER_MIN_CHARS = 64
+    RENDER_INTERVAL = 1 / 15  # Matches the Live refresh rate
+
     def __init__(self):
         self.content = ""
         self.live: Optional[Live] = None
+        self._rendered_len = 0
+        self._last_render = 0.0
+        self._md_failing = False  # Last markdown parse raised
 
     def start(self):
         """Start the live display"""
         self.content = ""
+        self._rendered_len = 0
+        self._last_render = 0.0
+        self._md_failing = False
         self.live = Live(
             Text("", style=Colors.ASSISTANT),
             refresh_per_second=15,
@@ -184,16 +226,43 @@ class StreamingDisplay:
     def update(self, chunk: str):
         """Update with new content"""
         self.content += chunk
-        if self.live:
+        if self.live and (
+            len(self.content) - self._rendered_len >= self.RENDER_MIN_CHARS
+            or time.monotonic() - self._last_render >= self.RENDER_INTERVAL
+        ):
+            self._render()
+
+    def _render(self):
+        """Render the accumulated content"""
+        # After a failed parse, stay on plain text until the open fragment closes
+        if self._md_failing and self._has_open_fragment(self.content):
+            self.live.update(Text(self.content, style=Colors.ASSISTANT))
+        else:
             # Try to render as markdown
             try:
                 self.live.update(Markdown(self.content))
+                self._md_failing = False
             except Exception:
+                self._md_failing = True
                 self.live.update(Text(self.content, style=Colors.ASSISTANT))
+        self._rendered_len = len(self.content)
+        self._last_render = time.monotonic()
+
+    @staticmethod
+    def _has_open_fragment(text: str) -> bool:
+        """Check for an unclosed code fence, bracket or parenthesis"""
+        return (
+            text.count('```') % 2 == 1
+            or text.count('[') > text.count(']')
+            or text.count('(') > text.count(')')
+        )
 
     def stop(self):
         """Stop the live display"""
         if self.live:
+            # Show any text held back by the debounce
+            if self._rendered_len != len(self.content):
+                self._render()
             self.live.stop()
             self.live = None
 
@@ -249,11 +318,7 @@ class InteractiveSelector:
 
     def run(self) -> Optional[str]:
         """Run the interactive selector, returns selected value or None if cancelled"""
-        import sys
-        import termios
-        import tty
-
-        if not self.options:
+        if not self.options or termios is None:
             return None
 
         # Save terminal settings
@@ -262,38 +327,52 @@ class InteractiveSelector:
 
         try:
             tty.setraw(fd)
+            # Reads block for the first byte and return whatever else is
+            # already buffered, so a whole escape sequence arrives at once
+            attrs = termios.tcgetattr(fd)
+            attrs[6][termios.VMIN] = 1
+            attrs[6][termios.VTIME] = 0
+            termios.tcsetattr(fd, termios.TCSANOW, attrs)
             self._render()
 
+            last = len(self.options) - 1
             while True:
-                ch = sys.stdin.read(1)
-
-                if ch == '\x1b':  # Escape sequence
-                    next1 = sys.stdin.read(1)
-                    if next1 == '[':
-                        next2 = sys.stdin.read(1)
-                        if next2 == 'A':  # Up arrow
-                            self.selected_index = max(0, self.selected_index - 1)
-                            self._render()
-                        elif next2 == 'B':  # Down arrow
-                            self.selected_index = min(len(self.options) - 1, self.selected_index + 1)
-                            self._render()
-                    elif next1 == '\x1b':  # Double escape = cancel
+                data = os.read(fd, 8)
+                # Pick up the rest of an escape sequence split across reads
+                if data[:1] == b'\x1b' and len(data) < 3 and select.select([fd], [], [], 0.05)[0]:
+                    data += os.read(fd, 8)
+
+                index = self.selected_index
+                i = 0
+                while i < len(data):
+                    ch = data[i:i + 1]
+                    i += 1
+
+                    if ch == b'\x1b':  # Escape sequence
+                        if data[i:i + 1] == b'[':
+                            key = data[i + 1:i + 2]
+                            i += 2
+                            if key == b'A':  # Up arrow
+                                index = max(0, index - 1)
+                            elif key == b'B':  # Down arrow
+                                index = min(last, index + 1)
+                        else:  # Esc alone or double escape = cancel
+                            self._clear()
+                            return None
+                    elif ch == b'\r' or ch == b'\n':  # Enter
                         self._clear()
-                        return None
-                    else:
+                        return self.options[index][0]
+                    elif ch == b'q' or ch == b'\x03':  # q or Ctrl+C
                         self._clear()
                         return None
-                elif ch == '\r' or ch == '\n':  # Enter
-                    self._clear()
-                    return self.options[self.selected_index][0]
-                elif ch == 'q' or ch == '\x03':  # q or Ctrl+C
-                    self._clear()
-                    return None
-                elif ch == 'k':  # vim up
-                    self.selected_index = max(0, self.selected_index - 1)
-                    self._render()
-                elif ch == 'j':  # vim down
-                    self.selected_index = min(len(self.options) - 1, self.selected_index + 1)
+                    elif ch == b'k':  # vim up
+                        index = max(0, index - 1)
+                    elif ch == b'j':  # vim down
+                        index = min(last, index + 1)
+
+                # Redraw once per batch of keys
+                if index != self.selected_index:
+                    self.selected_index = index
                     self._render()
 
         finally:
@@ -301,16 +380,17 @@ class InteractiveSelector:
 
     def _render(self):
         """Render the selector"""
-        import sys
+        # Build the whole frame and write it at once
+        buf = []
 
         # Move cursor up and clear lines
-        sys.stdout.write('\r')
-        sys.stdout.write(f'\033[{len(self.options) + 2}A')  # Move up
-        sys.stdout.write('\033[J')  # Clear from cursor to end
+        buf.append('\r')
+        buf.append(f'\033[{len(self.options) + 2}A')  # Move up
+        buf.append('\033[J')  # Clear from cursor to end
 
         # Print title
-        sys.stdout.write(f'\033[1m{self.title}\033[0m\n')
-        sys.stdout.write('\033[90m↑/↓ select · Enter confirm · q/Esc cancel\033[0m\n')
+        buf.append(f'\033[1m{self.title}\033[0m\n')
+        buf.append('\033[90m↑/↓ select · Enter confirm · q/Esc cancel\033[0m\n')
 
         # Print options
         for i, (value, label) in enumerate(self.options):
@@ -327,16 +407,15 @@ class InteractiveSelector:
                 style_end = ''
 
             current_mark = ' \033[92m✓\033[0m' if is_current else ''
-            sys.stdout.write(f'{prefix}{style_start}{label}{style_end}{current_mark}\n')
+            buf.append(f'{prefix}{style_start}{label}{style_end}{current_mark}\n')
 
+        sys.stdout.write(''.join(buf))
         sys.stdout.flush()
 
     def _clear(self):
         """Clear the selector display"""
-        import sys
-        sys.stdout.write('\r')
-        sys.stdout.write(f'\033[{len(self.options) + 2}A')  # Move up
-        sys.stdout.write('\033[J')  # Clear from cursor to end
+        # Return to start, move up and clear from cursor to end
+        sys.stdout.write(f'\r\033[{len(self.options) + 2}A\033[J')
         sys.stdout.flush()
 
 